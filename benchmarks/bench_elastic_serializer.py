@@ -0,0 +1,79 @@
+"""⏱️ Records/second of ElasticHandler serialization: the old per-record path vs RecordSerializer.
+
+Run from the repo root:  python benchmarks/bench_elastic_serializer.py [--records N]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+
+from hephaestus.logging.elastic_handler import ElasticHandler
+
+_LEGACY_IGNORE_FIELDS = [
+    'asctime', 'created', 'filename', 'msg', 'stack_info', 'exc_info', 'args', 'msecs', 'module',
+    'level_emoji',
+]
+
+
+def legacy_serialize(handler: logging.Handler, record: logging.LogRecord) -> bytes:
+    """The serialization `ElasticHandler.emit` did before the fast path."""
+    handler.format(record)
+    log = {
+        ElasticHandler._RENAME_FIELDS.get(key, key): value
+        for key, value in record.__dict__.items()
+        if key not in _LEGACY_IGNORE_FIELDS
+    }
+    log['@timestamp'] = datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat()
+    return json.dumps(log, default=str).encode() + b'\n'
+
+
+def make_records(count: int) -> list[logging.LogRecord]:
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    records = []
+    for i in range(count):
+        kind = i % 10
+        if kind == 0:
+            record = logging.LogRecord('bench.errors', logging.ERROR, __file__, 10, 'failed %s', (i,), exc_info)
+        elif kind < 4:
+            record = logging.LogRecord('bench.extra', logging.INFO, __file__, 20, 'user %s did %s', ('u', i), None)
+            record.user_id = i
+            record.request = {'path': '/api', 'method': 'GET'}
+        else:
+            record = logging.LogRecord('bench.plain', logging.DEBUG, __file__, 30, 'plain message', None, None)
+        records.append(record)
+    return records
+
+
+def bench(name: str, serialize, count: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        records = make_records(count)  # Fresh records: exc_text caching must not leak across runs
+        start = time.perf_counter()
+        for record in records:
+            serialize(record)
+        best = min(best, time.perf_counter() - start)
+    rate = count / best
+    print(f'{name:<12} {rate:>12,.0f} records/s')
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    handler = ElasticHandler()
+    before = bench('before', lambda record: legacy_serialize(handler, record), args.records, args.repeat)
+    after = bench('after', handler._serializer.serialize, args.records, args.repeat)
+    print(f'speedup      {after / before:>12.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""⏱️ Cost of CustomFormatter.format, with and without exceptions.
+
+Compares the previous formatter (per-record colorizing, split/join of
+multi-line messages) with the current colored and plain modes.
+
+Run from the repo root:  python benchmarks/bench_formatter.py [--records N]
+"""
+import argparse
+import logging
+import sys
+import time
+
+from hephaestus.logging.formatters import DARK_GREEN, NORM, WHITE, CustomFormatter
+
+
+class LegacyFormatter(CustomFormatter):
+    """The formatting path CustomFormatter had before templates and caching."""
+
+    def __init__(self):
+        super().__init__(plain=False)
+        fmt = (f'{WHITE}%(asctime)s{NORM} '
+               f'%(level_emoji)s {NORM} '
+               f'[{DARK_GREEN}%(name)s{NORM}] '
+               f'{self._msg_color}%(message)s{NORM}')
+        logging.Formatter.__init__(self, fmt=fmt, datefmt=None, style='%')
+
+    formatException = logging.Formatter.formatException
+
+    def format(self, record):
+        if record.exc_info:
+            exc_text = record.exc_text or self.formatException(record.exc_info)
+            record.exc_text = self.colorize_exception(exc_text)
+
+        record.name_color = self._name_colors[record.levelno]
+        record.level_emoji = self._name_emojis[record.levelno]
+
+        msg = logging.Formatter.format(self, record)
+
+        if record.exc_text:
+            record.exc_text = exc_text
+        del record.name_color
+        return msg
+
+    def formatMessage(self, record):
+        msg = self._style.format(record)
+        if '\n' in msg:
+            first, *others = msg.split('\n')
+            meta = self._extract_metadata(first)
+            msg = '\n'.join((first, *(f'{meta}{line}' for line in others)))
+        return msg
+
+
+def _nested_failure(depth: int):
+    if depth:
+        _nested_failure(depth - 1)
+    raise ConnectionError('upstream LLM call failed')
+
+
+def make_records(count: int, with_exc: bool) -> list[logging.LogRecord]:
+    try:
+        _nested_failure(8)
+    except ConnectionError:
+        exc_info = sys.exc_info()
+
+    records = []
+    for i in range(count):
+        if with_exc:
+            # Same trace every time, like a retry storm
+            record = logging.LogRecord('bench', logging.ERROR, __file__, 10, 'retry %s failed', (i,), exc_info)
+        elif i % 5 == 0:
+            record = logging.LogRecord('bench', logging.INFO, __file__, 20, 'line one\nline two %s', (i,), None)
+        else:
+            record = logging.LogRecord('bench', logging.INFO, __file__, 30, 'request %s done', (i,), None)
+        records.append(record)
+    return records
+
+
+def bench(formatter: logging.Formatter, count: int, with_exc: bool, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        records = make_records(count, with_exc)
+        start = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    formatters = {
+        'before': LegacyFormatter(),
+        'colored': CustomFormatter(plain=False),
+        'plain': CustomFormatter(plain=True),
+    }
+    print(f'{"":<10}{"no exception":>16}{"with exception":>18}   (µs/record)')
+    for name, formatter in formatters.items():
+        without = bench(formatter, args.records, False, args.repeat)
+        with_exc = bench(formatter, args.records, True, args.repeat)
+        print(f'{name:<10}{without:>16.2f}{with_exc:>18.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""⏱️ Cold import time of the hephaestus subpackages, checked against a budget.
+
+Each module is imported in a fresh interpreter with `-X importtime`; the
+cumulative time of the top-level imports is compared with its budget and the
+script exits non-zero when any module goes over (or fails to import).
+
+Run from the repo root:  python benchmarks/bench_import_time.py [--budget-ms N] [--top N] [module ...]
+"""
+import argparse
+import subprocess
+import sys
+
+# Milliseconds, generous enough for a cold cache on a small CI box. Most modules
+# pay for pydantic-settings via hephaestus.settings; heavy clients (Celery,
+# mem0, Chroma, Langfuse, Redis) must only be imported on first use.
+BUDGETS_MS = {
+    'hephaestus': 50,
+    'hephaestus.settings': 450,
+    'hephaestus.logging': 500,
+    'hephaestus.langfuse_handler': 500,
+    'hephaestus.checkpointer.init_checkpointer': 500,
+    'hephaestus.memory.initialize_mem0': 50,
+    'hephaestus.task_queue': 50,
+    'hephaestus.agent_architectures': 1500,  # langgraph itself
+}
+
+
+def measure(module: str, startup: frozenset[str] = frozenset()) -> tuple[float, list[tuple[float, str]], str]:
+    """Import `module` in a subprocess. Returns (total ms, per-import ms, error).
+
+    Top-level imports named in `startup` (interpreter start-up, e.g. `site`) are not counted.
+    """
+    statement = f'import {module}' if module else 'pass'
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True,
+    )
+
+    total_us = 0
+    imports = []
+    nested = []
+    errors = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            errors.append(line)
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header
+        cumulative = int(fields[1])
+        name = fields[2].rstrip()
+        nested.append((cumulative / 1000, name.strip()))
+        if name.startswith('  '):
+            continue
+
+        # A top-level import is printed after everything it pulled in
+        if name.strip() not in startup:
+            imports.extend(nested)
+            # Nested imports are already included in their parent's cumulative time
+            total_us += cumulative
+        nested = []
+
+    error = errors[-1] if proc.returncode else ''
+    return total_us / 1000, imports, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=list(BUDGETS_MS))
+    parser.add_argument('--budget-ms', type=float, help='one budget for every module')
+    parser.add_argument('--top', type=int, default=0, help='show the N slowest imports of each module')
+    args = parser.parse_args()
+
+    _, startup_imports, _ = measure('')
+    startup = frozenset(name for _, name in startup_imports)
+
+    failed = False
+    print(f'{"module":<45}{"ms":>10}{"budget":>10}')
+    for module in args.modules:
+        budget = args.budget_ms or BUDGETS_MS.get(module, 500)
+        total, imports, error = measure(module, startup)
+        status = 'ok'
+        if error:
+            status = f'ERROR {error}'
+        elif total > budget:
+            status = 'OVER BUDGET'
+        failed |= status != 'ok'
+        print(f'{module:<45}{total:>10.1f}{budget:>10.0f}   {status}')
+
+        for ms, name in sorted(imports, reverse=True)[:args.top]:
+            print(f'    {ms:>10.1f}  {name}')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
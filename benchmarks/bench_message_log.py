@@ -0,0 +1,91 @@
+"""⏱️ MessageLog + MessageLogChannel vs. the previous `Annotated[list, operator.add]` state.
+
+Runs a graph of `--nodes` nodes, each appending one message to a history of
+`--history` messages, with and without an in-memory checkpointer.
+Also times the bare reducers.
+
+Run from the repo root:  python benchmarks/bench_message_log.py [--history N] [--nodes N]
+"""
+import argparse
+import asyncio
+import operator
+import time
+from typing import Annotated
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+from pydantic import BaseModel
+
+from hephaestus.agent_architectures import AgentSwarmState, append_messages
+
+
+class ListState(BaseModel, extra='allow'):
+    """AgentSwarmState as it was before MessageLog."""
+
+    messages: Annotated[list[AnyMessage], operator.add]
+
+
+def build_graph(state_cls, nodes: int, checkpointer):
+    async def node(state):
+        return {"messages": [AIMessage(f"reply {len(state.messages)}")]}
+
+    graph = StateGraph(state_cls)
+    names = [f'node_{i}' for i in range(nodes)]
+    for name in names:
+        graph.add_node(name, node)
+    for src, dst in zip([START, *names], [*names, END]):
+        graph.add_edge(src, dst)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def make_history(size: int) -> list[AnyMessage]:
+    return [(HumanMessage if i % 2 else AIMessage)(f"message {i} " + "lorem ipsum " * 20, id=f"m{i}")
+            for i in range(size)]
+
+
+async def bench_graph(state_cls, history, nodes: int, checkpoint: bool, repeat: int) -> float:
+    best = float('inf')
+    for i in range(repeat):
+        saver = InMemorySaver() if checkpoint else None
+        graph = build_graph(state_cls, nodes, saver)
+        config = {"configurable": {"thread_id": str(i)}} if checkpoint else None
+        start = time.perf_counter()
+        await graph.ainvoke({"messages": history}, config)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_reducer(reducer, history, appends: int) -> float:
+    value = reducer([], history)
+    updates = [[AIMessage(f"reply {i}")] for i in range(appends)]
+    start = time.perf_counter()
+    for update in updates:
+        value = reducer(value, update)
+    return (time.perf_counter() - start) / appends * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--history', type=int, default=5000)
+    parser.add_argument('--nodes', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    history = make_history(args.history)
+    print(f'history={args.history} messages, {args.nodes} nodes')
+    print(f'{"":<22}{"list + operator.add":>22}{"MessageLog":>14}')
+
+    for checkpoint in (False, True):
+        label = 'graph (checkpointed)' if checkpoint else 'graph'
+        before = await bench_graph(ListState, history, args.nodes, checkpoint, args.repeat)
+        after = await bench_graph(AgentSwarmState, history, args.nodes, checkpoint, args.repeat)
+        print(f'{label:<22}{before:>19.1f} ms{after:>11.1f} ms')
+
+    before = bench_reducer(operator.add, history, 1000)
+    after = bench_reducer(append_messages, history, 1000)
+    print(f'{"reducer (per append)":<22}{before:>19.2f} µs{after:>11.2f} µs')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""⏱️ Settings read cost: the Pydantic `DynamicModel` path vs the frozen view.
+
+Run from the repo root:  python benchmarks/bench_settings_lookup.py [--number N]
+"""
+import argparse
+import timeit
+
+from hephaestus.settings import get_frozen_settings, settings
+
+CASES = [
+    ('attribute', 's.celery.broker_pool_limit', 'f.celery.broker_pool_limit'),
+    ('item', "s['celery']['broker_pool_limit']", "f['celery']['broker_pool_limit']"),
+    ('get', "s.celery.get('broker_pool_limit')", "f.celery.get('broker_pool_limit')"),
+    ('contains', "'broker_pool_limit' in s.celery", "'broker_pool_limit' in f.celery"),
+    ('dotted path', "s.celery.broker_transport_options.retry_policy.timeout",
+     "f.lookup('celery.broker_transport_options.retry_policy.timeout')"),
+    ('keys', 's.celery.keys()', 'f.celery.keys()'),
+    ('model_dump', 's.logging.model_dump()', 'f.logging.model_dump()'),
+]
+
+
+def per_call_ns(statement: str, namespace: dict, number: int) -> float:
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=20_000)
+    args = parser.parse_args()
+
+    namespace = {'s': settings, 'f': get_frozen_settings()}
+    print(f'{"":<14}{"pydantic":>12}{"frozen":>12}   (ns/call)')
+    for name, pydantic_stmt, frozen_stmt in CASES:
+        number = args.number // 10 if name == 'model_dump' else args.number
+        before = per_call_ns(pydantic_stmt, namespace, number)
+        after = per_call_ns(frozen_stmt, namespace, number)
+        print(f'{name:<14}{before:>12.0f}{after:>12.0f}   {before / after:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
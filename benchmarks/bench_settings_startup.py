@@ -0,0 +1,59 @@
+"""⏱️ Settings startup cost: building `Settings()` vs reading the YAML files from the cache.
+
+Reports in-process timings (build, cache key, cached load) and the wall time
+of `python -c "import hephaestus.settings"` with and without the cache.
+
+Run from the repo root:  python benchmarks/bench_settings_startup.py [--repeat N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from hephaestus.settings import SETTINGS_CACHE_ENV, Settings, load_settings, settings_cache_key
+
+
+def best_of(repeat: int, func) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_time(repeat: int, env: dict) -> float:
+    command = [sys.executable, '-c', 'import hephaestus.settings']
+    return best_of(repeat, lambda: subprocess.run(command, env=env, check=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached_env = {**os.environ, SETTINGS_CACHE_ENV: cache_dir}
+        uncached_env = {key: value for key, value in os.environ.items() if key != SETTINGS_CACHE_ENV}
+
+        os.environ[SETTINGS_CACHE_ENV] = cache_dir
+        load_settings()  # Write the cache
+
+        build = best_of(args.repeat, Settings)
+        key = best_of(args.repeat, settings_cache_key)
+        load = best_of(args.repeat, load_settings)
+        print(f'Settings()               {build:8.2f} ms')
+        print(f'settings_cache_key()     {key:8.2f} ms')
+        print(f'load_settings() (hit)    {load:8.2f} ms   {build / load:.1f}x faster')
+
+        subprocess.run([sys.executable, '-c', 'import hephaestus.settings'], env=cached_env, check=True)
+        without = import_time(max(3, args.repeat // 4), uncached_env)
+        with_cache = import_time(max(3, args.repeat // 4), cached_env)
+        print(f'import, no cache        {without:8.2f} ms')
+        print(f'import, cache           {with_cache:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,6 @@
+from .agent_cache import AgentCache
+from .context import ContextPolicy, LastK, SystemPlusRecent, TokenBudget
 from .daisy_chain import create_daisy_chain
-from .utils import AgentSwarmState, message_delta, _wrap_agent_return_delta as wrap_agent_return_delta
\ No newline at end of file
+from .message_log import MessageList, MessageLog, MessageLogChannel, MessageLogDeltaChannel, append_messages
+from .parallel_swarm import create_parallel_swarm
+from .utils import AgentSwarmState, DeltaAgentSwarmState, message_delta, _wrap_agent_return_delta as wrap_agent_return_delta
\ No newline at end of file
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Iterable
+
+from langchain_core.messages import AnyMessage, messages_from_dict, messages_to_dict
+from langchain_core.runnables import RunnableConfig
+
+from hephaestus.settings import get_frozen_settings
+
+logger = logging.getLogger(__name__)
+
+# Per-message fields that differ between otherwise identical runs (ids, token usage, latency...)
+_VOLATILE_FIELDS = ('id', 'response_metadata', 'usage_metadata')
+
+
+class AgentCache:
+    """🗃️ Memoizes wrapped agents: same agent + same input -> same message delta.
+
+    Meant for deterministic (temperature 0) agents that get re-invoked on
+    replays, retries and Celery redeliveries. The key is a hash of the agent
+    name, the (projected) input messages and the `config_keys` picked from
+    `config["configurable"]`.
+
+    Two tiers: an in-process LRU (`local_max_entries`) and, when a Redis URL
+    is available, a shared Redis tier whose entries expire after `ttl`
+    seconds and are evicted oldest-first beyond `redis_max_entries`.
+    Redis errors only count as misses. Hit/miss counters are in `stats()`.
+
+    Hits are fresh copies of the stored messages with new ids, so replaying
+    one never aliases or (under `add_messages`) replaces the original messages.
+    `aclose()` closes the Redis client of the running loop.
+
+    Defaults come from `settings.agent_cache`; the Redis URL from `settings.REDIS_URL`.
+    """
+
+    def __init__(self, redis_url: str | None = None, ttl: float | None = None,
+                 local_max_entries: int | None = None, redis_max_entries: int | None = None,
+                 key_prefix: str | None = None, config_keys: Iterable[str] = ()):
+        frozen = get_frozen_settings()
+        defaults = frozen.agent_cache
+        if redis_url is None and frozen.get('REDIS_URL'):
+            redis_url = f'redis://{frozen.REDIS_URL}'
+        self.redis_url = redis_url
+        self.ttl = defaults.ttl if ttl is None else ttl
+        self.local_max_entries = defaults.local_max_entries if local_max_entries is None else local_max_entries
+        self.redis_max_entries = defaults.redis_max_entries if redis_max_entries is None else redis_max_entries
+        self.key_prefix = key_prefix or defaults.key_prefix
+        self.config_keys = tuple(config_keys)
+
+        self._local: OrderedDict[str, tuple[float, list[AnyMessage]]] = OrderedDict()
+        self._lock = threading.Lock()
+        # redis.asyncio clients are bound to the loop they connected on
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # 📊 Counters
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    def stats(self) -> dict[str, int]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'redis_hits': self.redis_hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'errors': self.errors,
+            'local_entries': len(self._local),
+            'hit_rate': (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
+
+    def key(self, agent_name: str, messages: list[AnyMessage], config: RunnableConfig | None = None) -> str:
+        """Stable hash of what the agent's output depends on."""
+        configurable = (config or {}).get('configurable') or {}
+        payload = {
+            'agent': agent_name,
+            'messages': [
+                {'type': message['type'],
+                 **{field: value for field, value in message['data'].items() if field not in _VOLATILE_FIELDS}}
+                for message in messages_to_dict(messages)
+            ],
+            'config': {name: configurable.get(name) for name in self.config_keys},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    async def get(self, key: str) -> list[AnyMessage] | None:
+        messages = self._get_local(key)
+        if messages is not None:
+            self.local_hits += 1
+            return _replay(messages)
+
+        client = self._client()
+        if client is not None:
+            try:
+                raw = await client.get(self._redis_key(key))
+                if raw is not None:
+                    messages = messages_from_dict(json.loads(raw))
+                    await client.zadd(self._index_key, {key: time.time()})
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Agent cache lookup failed: {e}")
+                messages = None
+
+            if messages is not None:
+                self.redis_hits += 1
+                self._set_local(key, messages)
+                return _replay(messages)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, messages: list[AnyMessage]):
+        self._set_local(key, messages)
+        self.stores += 1
+
+        client = self._client()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(self._redis_key(key), json.dumps(messages_to_dict(messages)), px=max(int(self.ttl * 1000), 1))
+                pipe.zadd(self._index_key, {key: time.time()})
+                pipe.zcard(self._index_key)
+                *_, size = await pipe.execute()
+
+            if size > self.redis_max_entries:
+                evicted = await client.zpopmin(self._index_key, size - self.redis_max_entries)
+                if evicted:
+                    await client.delete(*(self._redis_key(old_key.decode() if isinstance(old_key, bytes) else old_key)
+                                          for old_key, _ in evicted))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Agent cache store failed: {e}")
+
+    async def aclose(self):
+        """Close the Redis client of the running loop (each loop that used the cache has its own)."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    @property
+    def _index_key(self) -> str:
+        return f'{self.key_prefix}:index'
+
+    def _redis_key(self, key: str) -> str:
+        return f'{self.key_prefix}:{key}'
+
+    def _get_local(self, key: str) -> list[AnyMessage] | None:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, messages = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+        return messages
+
+    def _set_local(self, key: str, messages: list[AnyMessage]):
+        if self.local_max_entries <= 0:
+            return
+        with self._lock:
+            # A copy: the graph goes on using (and may modify) the messages it was given
+            self._local[key] = (time.monotonic() + self.ttl, [message.model_copy(deep=True) for message in messages])
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _client(self):
+        if not self.redis_url:
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            from redis.asyncio import Redis
+            client = self._clients[loop] = Redis.from_url(self.redis_url)
+        return client
+
+
+def _replay(messages: list[AnyMessage]) -> list[AnyMessage]:
+    """Copies of cached messages to hand out, each with a new id."""
+    return [message.model_copy(deep=True, update={'id': str(uuid.uuid4())}) for message in messages]
+
+
+def cache_for(cache: AgentCache | dict[str, AgentCache] | None, agent_name: str) -> AgentCache | None:
+    """The cache of one agent: `cache` applies to all agents, or pick per name from a dict."""
+    if isinstance(cache, dict):
+        return cache.get(agent_name)
+    return cache
@@ -0,0 +1,137 @@
+from collections import OrderedDict
+from typing import Callable
+
+from langchain_core.messages import AnyMessage, BaseMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from hephaestus.agent_architectures.message_log import MessageLog
+
+# Picks the part of the shared history an agent gets to see
+ContextPolicy = Callable[[list[AnyMessage]], list[AnyMessage]]
+
+
+def project_context(messages: list[AnyMessage], context: ContextPolicy | None) -> list[AnyMessage]:
+    """Apply `context` to `messages` (all of them when there is no policy), as a plain list."""
+    if context is not None:
+        messages = context(messages)
+    if isinstance(messages, MessageLog):
+        # Child agents reduce their own state with list-based reducers
+        return messages.to_list()
+    return messages
+
+
+def _window_start(messages: list[AnyMessage], start: int, floor: int = 0) -> int:
+    """Where a window meant to begin at `start` must begin, so it doesn't open on orphan tool results.
+
+    The window is extended back (never past `floor`) to the message that made
+    the tool calls. Tool results whose call is missing from the history are
+    dropped, unless they are all that is left: a non-empty history never
+    gives an empty window.
+    """
+    extended = start
+    while extended > floor and isinstance(messages[extended], ToolMessage):
+        extended -= 1
+    if not isinstance(messages[extended], ToolMessage):
+        return extended
+
+    trimmed = start
+    while trimmed < len(messages) and isinstance(messages[trimmed], ToolMessage):
+        trimmed += 1
+    return trimmed if trimmed < len(messages) else start
+
+
+class LastK:
+    """🔚 Only the last `k` messages (more when tool results need their tool call)."""
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        self.k = k
+
+    def __call__(self, messages: list[AnyMessage]) -> list[AnyMessage]:
+        if len(messages) <= self.k:
+            return messages
+        return messages[_window_start(messages, len(messages) - self.k):]
+
+
+class SystemPlusRecent:
+    """📌 The leading system message(s), plus the last `k` messages after them."""
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        self.k = k
+
+    def __call__(self, messages: list[AnyMessage]) -> list[AnyMessage]:
+        n_system = 0
+        while n_system < len(messages) and isinstance(messages[n_system], SystemMessage):
+            n_system += 1
+
+        if len(messages) - n_system <= self.k:
+            return messages
+        start = _window_start(messages, len(messages) - self.k, floor=n_system)
+        return messages[:n_system] + messages[start:]
+
+
+class TokenBudget:
+    """💰 The most recent messages that fit in `max_tokens`.
+
+    Token counts are cached per message (by id, or by content for messages
+    without one), so a long conversation is only counted once, not on every hop.
+    `count_tokens` defaults to langchain's character-based approximation; pass
+    e.g. `lambda m: model.get_num_tokens_from_messages([m])` for exact counts.
+    With `keep_system`, leading system messages are always kept and count
+    against the budget.
+    """
+
+    def __init__(self, max_tokens: int, count_tokens: Callable[[BaseMessage], int] | None = None,
+                 keep_system: bool = True, cache_size: int = 8192):
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens or (lambda message: count_tokens_approximately([message]))
+        self.keep_system = keep_system
+        self.cache_size = cache_size
+        self._counts: OrderedDict = OrderedDict()
+
+    def __call__(self, messages: list[AnyMessage]) -> list[AnyMessage]:
+        n_system = 0
+        if self.keep_system:
+            while n_system < len(messages) and isinstance(messages[n_system], SystemMessage):
+                n_system += 1
+
+        budget = self.max_tokens - sum(self.tokens(m) for m in messages[:n_system])
+        start = len(messages)
+        while start > n_system:
+            budget -= self.tokens(messages[start - 1])
+            if budget < 0:
+                break
+            start -= 1
+
+        if start == n_system:
+            return messages
+        # Always hand over the latest message (and the tool call it answers), even over budget
+        start = _window_start(messages, min(start, len(messages) - 1), floor=n_system)
+        return messages[:n_system] + messages[start:]
+
+    def tokens(self, message: BaseMessage) -> int:
+        """Token count of one message, cached."""
+        key = self._cache_key(message)
+        if key is None:
+            return self.count_tokens(message)
+
+        count = self._counts.get(key)
+        if count is None:
+            count = self._counts[key] = self.count_tokens(message)
+            if len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        else:
+            self._counts.move_to_end(key)
+        return count
+
+    @staticmethod
+    def _cache_key(message: BaseMessage):
+        if message.id:
+            return message.id
+        if isinstance(message.content, str) and not getattr(message, 'tool_calls', None):
+            # str caches its own hash, so this stays cheap for long messages
+            return (message.type, message.content)
+        return None
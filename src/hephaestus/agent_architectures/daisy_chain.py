@@ -1,10 +1,33 @@
 from langgraph.graph import END, START, StateGraph
 
-from hephaestus.agent_architectures.utils import AgentSwarmState, _wrap_agent_return_delta
-
-def create_daisy_chain(*agents: StateGraph, name: str) -> StateGraph:
+from hephaestus.agent_architectures.agent_cache import AgentCache, cache_for
+from hephaestus.agent_architectures.context import ContextPolicy
+from hephaestus.agent_architectures.utils import (
+    AgentSwarmState,
+    _wrap_agent_return_delta,
+    _wrap_agent_stream_delta,
+)
+
+def create_daisy_chain(*agents: StateGraph, name: str, stream: bool = False,
+                       context: ContextPolicy | None = None,
+                       cache: AgentCache | dict[str, AgentCache] | None = None,
+                       state_schema: type[AgentSwarmState] = AgentSwarmState) -> StateGraph:
     """
     Create a daisy chain from one or more agents.
+
+    With `stream=True`, each agent's message chunks are forwarded as they are
+    generated, tagged with the agent name: consume them with
+    `chain.astream(..., stream_mode="custom")`.
+
+    `context` limits the history each agent is given, e.g. `LastK(20)`,
+    `TokenBudget(8000)` or `SystemPlusRecent(10)`; the chain's state still
+    keeps every message.
+
+    `cache` memoizes agents (see `AgentCache`): one cache for every agent, or
+    a dict of agent name -> cache to turn it on for some agents only.
+
+    `state_schema=DeltaAgentSwarmState` makes checkpoints store only the
+    messages appended since the previous checkpoint.
     """
     if not all(hasattr(a, 'name') for a in agents):
         raise ValueError("All agents must have a name.")
@@ -12,10 +35,11 @@ def create_daisy_chain(*agents: StateGraph, name: str) -> StateGraph:
     # if len(agents) < 2:
     #     raise ValueError("A daisy chain must have at least two agents.")
 
-    graph = StateGraph[AgentSwarmState, None, AgentSwarmState, AgentSwarmState](AgentSwarmState)
+    graph = StateGraph[AgentSwarmState, None, AgentSwarmState, AgentSwarmState](state_schema)
 
+    wrap = _wrap_agent_stream_delta if stream else _wrap_agent_return_delta
     for agent in agents:
-        graph.add_node(agent.name, _wrap_agent_return_delta(agent))
+        graph.add_node(agent.name, wrap(agent, context, cache_for(cache, agent.name)), input_schema=state_schema)
 
     node_names = [START, *[a.name for a in agents], END]
 
@@ -0,0 +1,206 @@
+import threading
+from collections.abc import Iterable, Sequence
+from itertools import islice
+from typing import Any
+
+from langchain_core.messages import AnyMessage
+from langgraph.channels.binop import BinaryOperatorAggregate
+from langgraph.channels.delta import DeltaChannel
+from pydantic_core import core_schema
+
+# Guards the "is this the newest version?" check + extend in `MessageLog.extended`
+_append_lock = threading.Lock()
+
+
+class MessageLog(Sequence):
+    """📜 Immutable, append-only list of messages with structural sharing.
+
+    Every version of the log is a `(items, length)` view on one shared list.
+    Appending extends the shared list in place when this view is its newest
+    version and returns a longer view, so older versions stay valid and nothing
+    is copied. Only appending to an older version (a branch) copies its prefix.
+
+    Slices are plain lists, so `message_delta` and context policies work as
+    before, and `log[n:]` is the delta since length `n`.
+
+    It is what `MessageLogChannel` stores; states, writes and checkpoints
+    only ever see plain lists (`MessageList`).
+    """
+
+    __slots__ = ('_items', '_len')
+
+    def __init__(self, messages: Iterable[AnyMessage] = ()):
+        self._items = list(messages)
+        self._len = len(self._items)
+
+    @classmethod
+    def _view(cls, items: list, length: int) -> 'MessageLog':
+        log = cls.__new__(cls)
+        log._items = items
+        log._len = length
+        return log
+
+    def extended(self, messages: Iterable[AnyMessage]) -> 'MessageLog':
+        """A new version of the log with `messages` appended; `self` is unchanged."""
+        with _append_lock:
+            if len(self._items) == self._len:
+                items = self._items
+            else:
+                # Someone already appended to this version: branch off
+                items = self._items[:self._len]
+            items.extend(messages)
+            length = len(items)
+        return self._view(items, length)
+
+    def to_list(self) -> list[AnyMessage]:
+        return self._items[:self._len]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            return self._items[start:stop:step]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('MessageLog index out of range')
+        return self._items[index]
+
+    def __iter__(self):
+        return islice(self._items, self._len)
+
+    def __add__(self, other: Iterable[AnyMessage]) -> 'MessageLog':
+        return self.extended(other)
+
+    def __radd__(self, other: list[AnyMessage]) -> list[AnyMessage]:
+        return list(other) + self.to_list()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MessageLog):
+            if self._items is other._items:
+                return self._len == other._len
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __copy__(self) -> 'MessageLog':
+        return self
+
+    def __reduce__(self):
+        return MessageLog, (self.to_list(),)
+
+    def __repr__(self) -> str:
+        return f'MessageLog({self.to_list()!r})'
+
+
+class MessageList(list):
+    """📃 A plain-list copy of a `MessageLog`: the value of a `MessageLogChannel` field.
+
+    Node inputs and outputs, graph results and the writes a saver stores are
+    therefore plain lists, which every checkpointer serializer and list-based
+    reducer (e.g. `add_messages` in a parent `MessagesState` graph) takes as
+    is. The log it was copied from rides along in `log`, so appending to it
+    and validating it into a state again copy nothing.
+    """
+
+    __slots__ = ('log',)
+
+    def __init__(self, log: 'MessageLog | None' = None):
+        log = MessageLog() if log is None else log
+        super().__init__(log)
+        self.log = log
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler) -> core_schema.CoreSchema:
+        messages_schema = handler.generate_schema(list[AnyMessage])
+
+        def validate(value, validate_messages):
+            # State is rebuilt for every node: don't re-validate what a channel handed out
+            if isinstance(value, MessageList) and len(value) == len(value.log):
+                return value
+            if isinstance(value, MessageLog):
+                return cls(value)
+            return cls(MessageLog(validate_messages(value)))
+
+        return core_schema.no_info_wrap_validator_function(
+            validate,
+            messages_schema,
+            serialization=core_schema.plain_serializer_function_ser_schema(list, return_schema=messages_schema),
+        )
+
+
+def _as_log(messages: Sequence[AnyMessage]) -> MessageLog:
+    if isinstance(messages, MessageLog):
+        return messages
+    if isinstance(messages, MessageList) and len(messages) == len(messages.log):
+        return messages.log
+    return MessageLog(messages)
+
+
+def append_messages(left: Sequence[AnyMessage], right: Iterable[AnyMessage]) -> MessageLog:
+    """Reducer: `left + right` as a `MessageLog`, without copying `left` when it is (a copy of) one."""
+    return _as_log(left).extended(right)
+
+
+class MessageLogChannel(BinaryOperatorAggregate):
+    """Channel backed by a `MessageLog`: `Annotated[MessageList, MessageLogChannel]`.
+
+    Reduces with `append_messages`. Reads (`MessageList`) and checkpoints are
+    plain lists, the same values an `Annotated[list, operator.add]` field
+    gives, so existing threads load unchanged and no `MessageLog` ever
+    reaches a serializer or a parent graph.
+    """
+
+    def __init__(self, typ: type = MessageLog, operator=append_messages):
+        super().__init__(typ, operator)
+
+    def get(self):
+        value = super().get()
+        return MessageList(value) if isinstance(value, MessageLog) else value
+
+    def checkpoint(self):
+        value = super().checkpoint()
+        return value.to_list() if isinstance(value, MessageLog) else value
+
+    def from_checkpoint(self, checkpoint):
+        channel = super().from_checkpoint(checkpoint)
+        if isinstance(channel.value, list):
+            channel.value = MessageLog(channel.value)
+        return channel
+
+
+def _append_batches(left: Sequence[AnyMessage], writes: Sequence[Iterable[AnyMessage]]) -> MessageLog:
+    """`DeltaChannel` reducer: append a batch of writes in one go."""
+    return _as_log(left).extended(message for write in writes for message in write)
+
+
+class MessageLogDeltaChannel(DeltaChannel):
+    """Delta-checkpointed channel for `MessageLog` fields (LangGraph's beta `DeltaChannel`).
+
+    Checkpoints don't store the log: it is rebuilt from the appended deltas
+    (the node writes the saver keeps anyway) on top of a full snapshot taken
+    every `snapshot_frequency` updates, which also bounds how many ancestor
+    checkpoints a read walks. Storage grows linearly with the conversation
+    instead of quadratically. Snapshots hold a `MessageList`, so any saver
+    and serializer can store them.
+
+    Use an instance: `Annotated[MessageList, MessageLogDeltaChannel(snapshot_frequency=20)]`.
+    """
+
+    def __init__(self, reducer=_append_batches, typ: type = MessageLog, *, snapshot_frequency: int = 50):
+        super().__init__(reducer, typ, snapshot_frequency=snapshot_frequency)
+
+    def get(self):
+        value = super().get()
+        return MessageList(value) if isinstance(value, MessageLog) else value
+
+    def from_checkpoint(self, checkpoint):
+        channel = super().from_checkpoint(checkpoint)
+        if isinstance(channel.value, list):
+            channel.value = MessageLog(channel.value)
+        return channel
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import Annotated, TypedDict
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, StateGraph
+
+from hephaestus.agent_architectures.agent_cache import AgentCache, cache_for
+from hephaestus.agent_architectures.context import ContextPolicy
+from hephaestus.agent_architectures.utils import AgentSwarmState, _wrap_agent_return_delta
+
+logger = logging.getLogger(__name__)
+
+
+def create_parallel_swarm(*agents: StateGraph, name: str,
+                          max_concurrency: int | None = None,
+                          branch_timeout: float | None = None,
+                          context: ContextPolicy | None = None,
+                          cache: AgentCache | dict[str, AgentCache] | None = None,
+                          state_schema: type[AgentSwarmState] = AgentSwarmState) -> StateGraph:
+    """
+    Create a fan-out/fan-in swarm: every agent gets the same input and runs concurrently.
+
+    The message deltas are merged in the order the agents were given, whatever
+    order they finish in. `max_concurrency` caps how many agents run at once and
+    `branch_timeout` (seconds) drops an agent's contribution if it takes longer.
+    If an agent fails, the others are cancelled and the error is raised.
+    `context`, `cache` and `state_schema` work as in `create_daisy_chain`.
+
+    Each agent runs as its own node of one step, so every subgraph run has its
+    own task and checkpoint namespace under a checkpointer.
+
+    The result is a compiled graph with a name, so parallel swarms and daisy
+    chains can be nested in each other.
+    """
+    if not all(hasattr(a, 'name') for a in agents):
+        raise ValueError("All agents must have a name.")
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    agent_names = [agent.name for agent in agents]
+    if len(set(agent_names + [name])) != len(agent_names) + 1:
+        raise ValueError("Agent names must be unique and differ from the swarm's name.")
+
+    branches = [(agent.name, _wrap_agent_return_delta(agent, context, cache_for(cache, agent.name))) for agent in agents]
+
+    def branch_node(agent_name, wrapper):
+        async def branch(state: AgentSwarmState, config: RunnableConfig | None = None) -> dict:
+            try:
+                update = await asyncio.wait_for(wrapper(state, config), branch_timeout)
+            except TimeoutError:
+                logger.warning(f"⏱️ Agent {agent_name!r} in {name!r} timed out after {branch_timeout}s, skipping it")
+                update = {"messages": []}
+            return {"branch_deltas": {agent_name: list(update["messages"])}}
+
+        return branch
+
+    def fan_in(state: _BranchDeltas) -> dict:
+        # In agent order, whatever order they finished in
+        deltas = state["branch_deltas"]
+        return {"messages": [message for agent_name in agent_names for message in deltas.get(agent_name, [])],
+                "branch_deltas": None}
+
+    # One node per agent, all in the same step: each subgraph run gets its own task and checkpoint namespace
+    graph = StateGraph[AgentSwarmState, None, AgentSwarmState, AgentSwarmState](state_schema)
+    for agent_name, wrapper in branches:
+        graph.add_node(agent_name, branch_node(agent_name, wrapper), input_schema=state_schema)
+        graph.add_edge(START, agent_name)
+    graph.add_node(name, fan_in, input_schema=_BranchDeltas)
+    if agent_names:
+        graph.add_edge(agent_names, name)
+    else:
+        graph.add_edge(START, name)
+    graph.add_edge(name, END)
+
+    compiled = graph.compile(name=name)
+    if max_concurrency:
+        compiled = compiled.with_config(max_concurrency=max_concurrency)
+    return compiled
+
+
+def _merge_branch_deltas(current: dict[str, list], update: dict[str, list] | None) -> dict[str, list]:
+    """Collect the deltas of the branches by agent name; the fan-in clears them by writing None."""
+    if update is None:
+        return {}
+    return {**current, **update}
+
+
+class _BranchDeltas(TypedDict):
+    """Private channel between the branches of a parallel swarm and its fan-in node."""
+
+    branch_deltas: Annotated[dict[str, list], _merge_branch_deltas]
@@ -1,16 +1,29 @@
-import operator
 from typing import Annotated
 
 from langchain_core.messages import AnyMessage
 from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, START, StateGraph
+from langgraph.pregel import Pregel
 from pydantic import BaseModel
 
+from hephaestus.settings import settings
+from hephaestus.agent_architectures.agent_cache import AgentCache
+from hephaestus.agent_architectures.context import ContextPolicy, project_context
+from hephaestus.agent_architectures.message_log import MessageList, MessageLogChannel, MessageLogDeltaChannel
+
 
 class AgentSwarmState(BaseModel, extra='allow'):
     """🐝 Shared state flowing through every node in an agent swarm."""
 
-    messages: Annotated[list[AnyMessage], operator.add]
+    # Append-only: node updates are appended without copying the history
+    messages: Annotated[MessageList, MessageLogChannel]
+
+
+class DeltaAgentSwarmState(AgentSwarmState):
+    """🐝 `AgentSwarmState` whose checkpoints store message deltas instead of the whole history."""
+
+    messages: Annotated[MessageList, MessageLogDeltaChannel(snapshot_frequency=settings.checkpointer.delta_snapshot_frequency)]
 
 
 def message_delta(input_messages: list[AnyMessage], output_messages: list[AnyMessage]) -> list[AnyMessage]:
@@ -19,20 +32,82 @@ def message_delta(input_messages: list[AnyMessage], output_messages: list[AnyMes
     return output_messages[len_input:] if len_input <= len_output else []
 
 
-def _wrap_agent_return_delta(agent: object) -> object:
+def _wrap_agent_return_delta(agent: object, context: ContextPolicy | None = None,
+                             cache: AgentCache | None = None) -> object:
     """Wrap an agent so it returns only the messages it added (delta), not the full list.
 
     Child agents return their full accumulated messages. With operator.add, the swarm
     would concatenate that with its current state, duplicating all prior messages.
     This wrapper extracts only the new messages the agent produced.
+
+    `context` (e.g. `LastK(20)`) projects the history the agent is given; the
+    delta is taken against that projection, not against the full state.
+    With a `cache`, an identical input returns the stored delta instead.
     """
 
     async def wrapper(state: AgentSwarmState, config: RunnableConfig | None = None) -> dict:
         invoke_config = dict(config) if config else {}
         invoke_config["run_name"] = agent.name  # preserve character name in Langfuse when subgraph
-        result = await agent.ainvoke({"messages": state.messages}, invoke_config)
+        input_messages = project_context(state.messages, context)
+
+        if cache is not None:
+            key = cache.key(agent.name, input_messages, config)
+            delta = await cache.get(key)
+            if delta is not None:
+                return {"messages": delta}
+
+        result = await agent.ainvoke({"messages": input_messages}, invoke_config)
         output_messages = result['messages']
-        delta = message_delta(state.messages, output_messages)
+        delta = message_delta(input_messages, output_messages)
+        if cache is not None:
+            await cache.set(key, delta)
+        return {"messages": delta}
+
+    return wrapper
+
+
+def _wrap_agent_stream_delta(agent: object, context: ContextPolicy | None = None,
+                             cache: AgentCache | None = None) -> object:
+    """Like `_wrap_agent_return_delta`, but forwards the agent's output while it is produced.
+
+    Every message chunk the agent streams is passed to the parent graph's
+    stream writer as `{"agent": <name>, "message": <chunk>, "metadata": {...}}`,
+    so `graph.astream(..., stream_mode="custom")` shows tokens as soon as the
+    first agent emits them. The node returns (and the next agent starts) as
+    soon as the agent's run is complete.
+    """
+    if not isinstance(agent, Pregel):
+        # Nothing to stream from a plain runnable
+        return _wrap_agent_return_delta(agent, context, cache)
+
+    async def wrapper(state: AgentSwarmState, config: RunnableConfig | None = None) -> dict:
+        writer = get_stream_writer()
+        invoke_config = dict(config) if config else {}
+        invoke_config["run_name"] = agent.name  # preserve character name in Langfuse when subgraph
+
+        input_messages = project_context(state.messages, context)
+
+        if cache is not None:
+            key = cache.key(agent.name, input_messages, config)
+            delta = await cache.get(key)
+            if delta is not None:
+                # Replay the stored messages as whole chunks
+                for message in delta:
+                    writer({"agent": agent.name, "message": message, "metadata": {"cached": True}})
+                return {"messages": delta}
+
+        output_messages = input_messages
+        async for mode, chunk in agent.astream({"messages": input_messages}, invoke_config,
+                                               stream_mode=["messages", "values"]):
+            if mode == "messages":
+                message, metadata = chunk
+                writer({"agent": agent.name, "message": message, "metadata": metadata})
+            else:
+                output_messages = chunk['messages']
+
+        delta = message_delta(input_messages, output_messages)
+        if cache is not None:
+            await cache.set(key, delta)
         return {"messages": delta}
 
     return wrapper
@@ -0,0 +1,52 @@
+import logging
+from typing import Iterable
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+logger = logging.getLogger(__name__)
+
+
+async def compact_thread(saver: BaseCheckpointSaver, thread_id: str, *,
+                         delta_channels: Iterable[str] = ('messages',), keep_last: int = 1) -> int:
+    """🧹 Drop the checkpoints of a thread that its latest state no longer needs.
+
+    With `DeltaAgentSwarmState`, the latest state is rebuilt from the nearest
+    ancestor holding a full snapshot of each delta channel plus the writes
+    since. Everything older than that ancestor is pruned, never less than
+    `keep_last` checkpoints. Returns how many checkpoints were kept.
+
+    The saver must implement `aprune` (the Redis saver does). Expiry of idle
+    threads is the saver's TTL (`checkpointer.ttl` in settings).
+    """
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint_tuple = await saver.aget_tuple(config)
+    if checkpoint_tuple is None:
+        return 0
+
+    # Walk back to the snapshot the delta channels are rebuilt from (at most snapshot_frequency steps)
+    pending = {name for name in delta_channels if name in checkpoint_tuple.checkpoint['channel_versions']}
+    needed = 1
+    while True:
+        pending -= checkpoint_tuple.checkpoint['channel_values'].keys()
+        if not pending or checkpoint_tuple.parent_config is None:
+            break
+        checkpoint_tuple = await saver.aget_tuple(checkpoint_tuple.parent_config)
+        if checkpoint_tuple is None:
+            break
+        needed += 1
+
+    keep = max(keep_last, needed)
+    await saver.aprune([thread_id], keep_last=keep)
+    logger.debug(f"Compacted thread {thread_id!r}, kept the last {keep} checkpoints")
+    return keep
+
+
+async def compact_threads(saver: BaseCheckpointSaver, thread_ids: Iterable[str], **kwargs) -> dict[str, int]:
+    """`compact_thread` for each thread, e.g. from a periodic task. Failures are logged and skipped."""
+    kept = {}
+    for thread_id in thread_ids:
+        try:
+            kept[thread_id] = await compact_thread(saver, thread_id, **kwargs)
+        except Exception:
+            logger.exception(f"Failed to compact thread {thread_id!r}")
+    return kept
@@ -1,12 +1,155 @@
 import asyncio
-from hephaestus.settings import settings
-from langgraph.checkpoint.redis.aio import AsyncRedisSaver
+import logging
+import warnings
+import weakref
 
-async def _setup_checkpointer():
-    """Initialize the Redis checkpointer."""
-    checkpointer = AsyncRedisSaver(redis_url=f'redis://{settings.REDIS_URL}')
+from hephaestus.settings import get_frozen_settings
+
+logger = logging.getLogger(__name__)
+
+# One saver (and Redis connection pool) per event loop: redis.asyncio connections
+# are bound to the loop they were opened on.
+_savers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_setup_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class _LoopSaver:
+    """A loop's saver, plus the async generator that closes it when the loop shuts down."""
+
+    def __init__(self, saver, client, pool):
+        self.saver = saver
+        self.client = client
+        self.pool = pool
+        # `asyncio.run` / `loop.shutdown_asyncgens()` finalize pending async
+        # generators before closing the loop: that is our shutdown hook.
+        self.closer = self._close_on_shutdown()
+
+    async def start(self):
+        await self.closer.asend(None)
+
+    async def _close_on_shutdown(self):
+        try:
+            yield
+        finally:
+            # The saver holds on to its loop, so the weak key alone would never go away
+            _savers.pop(asyncio.get_running_loop(), None)
+            await self.aclose()
+
+    async def aclose(self):
+        try:
+            await self.client.aclose()
+            await self.pool.disconnect()
+        except Exception as e:
+            logger.warning(f"Failed to close the checkpointer's Redis pool: {e}")
+
+
+def _redis_url() -> str:
+    return f'redis://{get_frozen_settings().REDIS_URL}'
+
+
+def _make_pool():
+    from redis.asyncio import BlockingConnectionPool
+
+    pool_config = get_frozen_settings().checkpointer.pool
+    return BlockingConnectionPool.from_url(
+        _redis_url(),
+        max_connections=pool_config.max_connections,
+        timeout=pool_config.pool_timeout,
+        socket_timeout=pool_config.socket_timeout,
+        socket_connect_timeout=pool_config.socket_connect_timeout,
+        health_check_interval=pool_config.health_check_interval,
+        retry_on_timeout=pool_config.retry_on_timeout,
+    )
+
+
+async def _setup_checkpointer(redis_client=None):
+    """Initialize the Redis checkpointer (on `redis_client`, or a client of its own)."""
+    from langgraph.checkpoint.redis.aio import AsyncRedisSaver
+    from hephaestus.checkpointer.serde import CheckpointSerializer
+
+    checkpointer_config = get_frozen_settings().checkpointer
+    ttl = checkpointer_config.get('ttl')
+    if redis_client is None:
+        checkpointer = AsyncRedisSaver(redis_url=_redis_url(), ttl=ttl)
+    else:
+        checkpointer = AsyncRedisSaver(redis_client=redis_client, ttl=ttl)
+    compression = checkpointer_config.compression
+    checkpointer.serde = CheckpointSerializer(checkpointer.serde,
+                                              compress_threshold=compression.threshold,
+                                              compress_level=compression.level)
     await checkpointer.asetup()
     return checkpointer
 
-checkpointer = asyncio.run(_setup_checkpointer())
 
+def get_checkpointer():
+    """💾 The Redis checkpointer, for sync code: the saver of the process's worker loop.
+
+    The saver lives on `task_queue.worker_loop`, which outlives any one call,
+    so it can be handed to a graph that runs elsewhere: the saver's sync
+    methods hop onto its loop. From a coroutine, use `aget_checkpointer()`.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("get_checkpointer() would block the running event loop, "
+                           "use `await aget_checkpointer()` instead")
+    from hephaestus.task_queue.worker_loop import run_async
+
+    return run_async(aget_checkpointer())
+
+
+async def aget_checkpointer():
+    """💾 The Redis checkpointer of the running event loop, created on first use.
+
+    Each loop gets its own saver on a pooled Redis client (see
+    `checkpointer.pool` in settings), which is closed when the loop shuts down
+    (`asyncio.run` returning) or when a Celery worker process exits.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _savers.get(loop)
+    if entry is not None:
+        return entry.saver
+
+    lock = _setup_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        entry = _savers.get(loop)
+        if entry is None:
+            from redis.asyncio import Redis
+
+            pool = _make_pool()
+            client = Redis(connection_pool=pool)
+            try:
+                saver = await _setup_checkpointer(client)
+            except Exception:
+                await pool.disconnect()
+                raise
+            entry = _LoopSaver(saver, client, pool)
+            await entry.start()
+            _savers[loop] = entry
+    return entry.saver
+
+
+def close_checkpointers(timeout: float = 5.0):
+    """Close the savers of every loop that is still open (e.g. at Celery worker shutdown)."""
+    for loop, entry in list(_savers.items()):
+        _savers.pop(loop, None)
+        if loop.is_closed():
+            continue
+        try:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(entry.closer.aclose(), loop).result(timeout)
+            else:
+                loop.run_until_complete(entry.closer.aclose())
+        except Exception as e:
+            logger.warning(f"Failed to close checkpointer: {e}")
+
+
+def __getattr__(name):
+    # Keeps `from hephaestus.checkpointer.init_checkpointer import checkpointer` working
+    if name == 'checkpointer':
+        warnings.warn("`checkpointer` is deprecated, use `get_checkpointer()` or `await aget_checkpointer()`",
+                      DeprecationWarning, stacklevel=2)
+        return get_checkpointer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,66 @@
+import zlib
+from typing import Any
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from hephaestus.agent_architectures.message_log import MessageLog
+
+_COMPRESSED_SUFFIX = '+zlib'
+
+
+class CheckpointSerializer(SerializerProtocol):
+    """🗜️ Checkpoint serializer for hephaestus graphs, wrapping another serializer (`inner`).
+
+    - `MessageLog`s that reach it (also inside delta-channel snapshots) are
+      stored as plain lists.
+    - Payloads of `compress_threshold` bytes or more are zlib-compressed and
+      tagged `<type>+zlib`. Checkpoint documents are left alone: the Redis
+      saver stores those as JSON, not as blobs.
+
+    Blobs written without this serializer still load.
+    """
+
+    def __init__(self, inner: SerializerProtocol | None = None,
+                 compress_threshold: int = 4096, compress_level: int = 6):
+        self.inner = inner or JsonPlusSerializer()
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        is_checkpoint = isinstance(obj, dict) and 'channel_values' in obj
+        type_, data = self.inner.dumps_typed(_plain(obj))
+        if is_checkpoint or len(data) < self.compress_threshold:
+            return type_, data
+        return type_ + _COMPRESSED_SUFFIX, zlib.compress(data, self.compress_level)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.endswith(_COMPRESSED_SUFFIX):
+            type_ = type_[:-len(_COMPRESSED_SUFFIX)]
+            payload = zlib.decompress(payload)
+        return self.inner.loads_typed((type_, payload))
+
+    def __getattr__(self, name):
+        # Savers call helpers of their own serializer (e.g. the Redis JSON revival)
+        if name == 'inner':
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+
+def _plain(obj: Any) -> Any:
+    """Replace `MessageLog`s by lists, at the top level and in checkpoint channel values."""
+    if isinstance(obj, MessageLog):
+        return obj.to_list()
+    if _is_delta_snapshot(obj) and isinstance(obj.value, MessageLog):
+        return type(obj)(obj.value.to_list())
+    if isinstance(obj, dict) and isinstance(obj.get('channel_values'), dict):
+        values = obj['channel_values']
+        if any(isinstance(v, MessageLog) or _is_delta_snapshot(v) for v in values.values()):
+            return {**obj, 'channel_values': {k: _plain(v) for k, v in values.items()}}
+    return obj
+
+
+def _is_delta_snapshot(obj: Any) -> bool:
+    # LangGraph's (private) delta-channel snapshot: a `value`-only NamedTuple
+    return isinstance(obj, tuple) and getattr(type(obj), '_fields', None) == ('value',)
@@ -1,13 +1,35 @@
 import os
+from functools import cache
 
-from langfuse import get_client
-from langfuse.langchain import CallbackHandler
+from hephaestus.settings import get_frozen_settings
 
-from hephaestus.settings import settings
 
-os.environ.update(settings.langfuse.model_dump())
+@cache
+def get_langfuse():
+    """🪢 The Langfuse client, created (and langfuse imported) on first use."""
+    os.environ.update(get_frozen_settings().langfuse.model_dump())
 
-langfuse = get_client()
+    from langfuse import get_client
+    return get_client()
 
-langfuse_callback_handler = CallbackHandler()
 
+@cache
+def get_langfuse_callback_handler():
+    """LangChain callback handler reporting to Langfuse, created on first use."""
+    get_langfuse()
+
+    from langfuse.langchain import CallbackHandler
+    return CallbackHandler()
+
+
+_LAZY_ATTRIBUTES = {
+    'langfuse': get_langfuse,
+    'langfuse_callback_handler': get_langfuse_callback_handler,
+}
+
+
+def __getattr__(name):
+    # Keeps `from hephaestus.langfuse_handler import langfuse_callback_handler` working
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,5 @@
-from .init_logging import init_logger
+from .init_logging import get_logger, init_logger
 from .elastic_handler import ElasticHandler
 from .formatters import CustomFormatter
 
-__all__ = ["init_logger", "ElasticHandler", "CustomFormatter"]
\ No newline at end of file
+__all__ = ["init_logger", "get_logger", "ElasticHandler", "CustomFormatter"]
\ No newline at end of file
@@ -1,39 +1,145 @@
 import asyncio
 import atexit
 import logging
+import os
 import sys
 import threading
-from datetime import datetime, timezone
+import weakref
 
-from elasticsearch import AsyncElasticsearch
-from hephaestus.settings import settings
+from hephaestus.settings import get_frozen_settings
+
+from hephaestus.logging.log_buffer import DROP_OLDEST, BoundedLogBuffer
+from hephaestus.logging.log_serializer import RecordSerializer
+from hephaestus.logging.log_spool import DiskSpool
 
 logger = logging.getLogger('hephaestus.logging')
 es_logger = logging.getLogger('elasticsearch')
 
-# Dedicated event loop for ES logging (runs in background thread)
-_es_loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
-_es_thread = threading.Thread(target=_es_loop.run_forever, daemon=True, name="es-logging-thread")
-_es_thread.start()
 
-def _shutdown_es_loop():
-    _es_loop.call_soon_threadsafe(_es_loop.stop)
+class _EsRuntime:
+    """🧵 Dedicated event loop (in a background thread) and ES client for log shipping.
+
+    Built lazily on the first emit, once per process: after a fork the child
+    gets a fresh loop, thread and client (and so its own connection pool).
+    """
+
+    def __init__(self):
+        from elasticsearch import AsyncElasticsearch
+
+        settings = get_frozen_settings()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="es-logging-thread")
+        self.thread.start()
+        self.client = AsyncElasticsearch(
+            hosts=settings.ES_HOST,
+            basic_auth=(settings.ES_USERNAME, settings.ES_PASSWORD),
+            ca_certs=settings.ES_CA,
+            verify_certs=True,
+            ssl_show_warn=False,
+            headers={"accept": "application/json", "content-type": "application/json"},
+        )
+
+    def is_running(self) -> bool:
+        return self.loop.is_running()
+
+    def submit(self, coro) -> "asyncio.Future":
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def shutdown(self):
+        if not self.loop.is_running():
+            return
+        future = self.submit(self._close())
+        try:
+            future.result(timeout=1)
+        except Exception:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def _close(self):
+        """Cancel the flushers/replayers still parked on the loop, close the client, stop."""
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.client.close()
+        self.loop.stop()
+
+
+_runtime: _EsRuntime | None = None
+_runtime_lock = threading.Lock()
+# Set on the thread building the runtime: what it logs meanwhile (asyncio's selector,
+# elasticsearch, urllib3...) must not try to start the runtime again
+_building = threading.local()
+_handlers: "weakref.WeakSet[ElasticHandler]" = weakref.WeakSet()
+
 
-atexit.register(_shutdown_es_loop)
+def _get_runtime() -> _EsRuntime:
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _building.active = True
+                try:
+                    _runtime = _EsRuntime()
+                finally:
+                    _building.active = False
+    return _runtime
 
-es_client = AsyncElasticsearch(
-    hosts=settings.ES_HOST,
-    basic_auth=(settings.ES_USERNAME, settings.ES_PASSWORD),
-    ca_certs=settings.ES_CA,
-    verify_certs=True,
-    ssl_show_warn=False,
-    headers={"accept": "application/json", "content-type": "application/json"},
-)
+
+def _reset_after_fork():
+    """🍴 In a forked child the parent's loop thread is gone: start over lazily."""
+    global _runtime, _runtime_lock
+    _runtime = None
+    _runtime_lock = threading.Lock()
+    _building.active = False
+    for handler in list(_handlers):
+        handler._after_fork_in_child()
+
+
+def _shutdown():
+    """Flush every handler, then stop the ES loop (runs at exit)."""
+    for handler in list(_handlers):
+        handler.flush()
+    if _runtime is not None:
+        _runtime.shutdown()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+# Registered at import, before any handler exists, and so it runs after the
+# queue listener (if any) has handed its remaining records over.
+atexit.register(_shutdown)
+
+# Every document in a bulk body is preceded by this action line
+_BULK_ACTION = b'{"index":{}}\n'
+# Bulk item statuses worth retrying later (everything else is a permanent rejection)
+_RETRYABLE_STATUSES = {429, 502, 503, 504}
+# Handler options that can change at runtime (see `ElasticHandler.reconfigure`)
+_HANDLER_OPTIONS = {'batch_size', 'batch_max_bytes', 'flush_interval', 'flush_timeout', 'replay_interval'}
+_BUFFER_OPTIONS = {
+    'max_queue_size': 'max_size',
+    'max_queue_bytes': 'max_bytes',
+    'overflow_policy': 'policy',
+    'block_timeout': 'block_timeout',
+    'overflow_level': 'overflow_level',
+}
 
 
 class ElasticHandler(logging.Handler):
+    """📦 Buffers log records and ships them to Elasticsearch through the `_bulk` API.
 
-    _IGNORE_FIELDS = [
+    A batch is flushed when it reaches `batch_size` documents, `batch_max_bytes`
+    bytes of NDJSON, or when `flush_interval` seconds have passed - whichever
+    comes first. Whatever is still buffered is flushed at exit.
+
+    Records wait in a `BoundedLogBuffer`, so memory stays capped at
+    `max_queue_size` records / `max_queue_bytes` bytes however slow ES is;
+    `overflow_policy` decides what gets dropped once it is full.
+
+    With `spool_dir` set, records that overflow the buffer or that ES fails to
+    take are appended to a `DiskSpool` instead of being lost, and replayed in
+    bulk every `replay_interval` seconds once ES is reachable again.
+    """
+
+    _IGNORE_FIELDS = {
         'asctime',
         'created',
         'filename',
@@ -44,7 +150,7 @@ class ElasticHandler(logging.Handler):
         'msecs',
         'module',
         "level_emoji"
-    ]
+    }
     _RENAME_FIELDS = {
         'name': 'logger_name',
         'levelname': 'log_level',
@@ -54,26 +160,234 @@ class ElasticHandler(logging.Handler):
         'exc_text': 'traceback',
     }
 
+    def __init__(self, level=logging.NOTSET, batch_size: int = 500,
+                 batch_max_bytes: int = 5 * 1024 * 1024, flush_interval: float = 2.0,
+                 flush_timeout: float = 5.0, max_queue_size: int = 10000,
+                 max_queue_bytes: int = 50 * 1024 * 1024, overflow_policy: str = DROP_OLDEST,
+                 block_timeout: float = 0.5, overflow_level: int | str = logging.WARNING,
+                 spool_dir: str | None = None, spool_segment_bytes: int = 16 * 1024 * 1024,
+                 spool_max_segments: int = 64, replay_interval: float = 5.0):
+        super().__init__(level)
+        self.batch_size = batch_size
+        self.batch_max_bytes = batch_max_bytes
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+
+        self._serializer = RecordSerializer(self._IGNORE_FIELDS, self._RENAME_FIELDS)
+        self._buffer = BoundedLogBuffer(
+            max_size=max_queue_size,
+            max_bytes=max_queue_bytes,
+            policy=overflow_policy,
+            block_timeout=block_timeout,
+            overflow_level=overflow_level,
+        )
+        self._spool = DiskSpool(
+            spool_dir,
+            segment_max_bytes=spool_segment_bytes,
+            max_segments=spool_max_segments,
+        ) if spool_dir else None
+        self.replay_interval = replay_interval
+        self._wakeup: asyncio.Event | None = None
+        self._es_available = False
+
+        # 📊 Counters (see `stats`)
+        self.sent = 0
+        self.failed = 0
+
+        # The ES loop and the flusher/replayer tasks are started on the first emit
+        self._runtime: _EsRuntime | None = None
+        self._flusher = None
+        self._replayer = None
+        _handlers.add(self)
+
+    def stats(self) -> dict[str, int]:
+        """Queue and delivery counters: queued, queued_bytes, enqueued, dropped, sent, failed
+        (and spooled, replayed, spool_segments, spool_segments_dropped with a spool)."""
+        stats = {**self._buffer.stats(), 'sent': self.sent, 'failed': self.failed}
+        if self._spool:
+            stats.update(self._spool.stats())
+        return stats
+
+    def reconfigure(self, **options):
+        """🔧 Apply new handler options in place (settings hot reload).
+
+        Batching, flushing and buffer limits can change; the ES loop, client
+        and connection pool are kept. Raises `ValueError` for options that
+        need a new handler (e.g. the spool settings).
+        """
+        unsupported = options.keys() - _HANDLER_OPTIONS - _BUFFER_OPTIONS.keys()
+        if unsupported:
+            raise ValueError(f"ElasticHandler options {sorted(unsupported)} can't be changed in place")
+
+        self._buffer.reconfigure(**{
+            _BUFFER_OPTIONS[key]: value for key, value in options.items() if key in _BUFFER_OPTIONS
+        })
+        for key in options.keys() & _HANDLER_OPTIONS:
+            setattr(self, key, options[key])
+
+    def setFormatter(self, fmt):
+        # The formatter is only used to render tracebacks, the message is never formatted
+        super().setFormatter(fmt)
+        self._serializer.exc_formatter = fmt or logging.Formatter()
 
     def emit(self, record):
-        """Creates json from a log record and schedules its flush 📤"""
-        self.format(record)
+        """Creates json from a log record and buffers it for the next bulk flush 📤"""
+        try:
+            doc = self._serializer.serialize(record)
+        except Exception:
+            self.handleError(record)
+            return
 
-        log = {
-            self._RENAME_FIELDS.get(key, key): value
-            for key, value in record.__dict__.items()
-            if key not in self._IGNORE_FIELDS
-        }
-        log['@timestamp'] = datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat()
+        runtime = self._runtime
+        if runtime is None or runtime is not _runtime:
+            if getattr(_building, 'active', False):
+                # Logged while building the runtime: the flusher picks it up once started
+                dropped = self._buffer.put(record.levelno, doc, can_block=False)
+                if dropped and self._spool:
+                    self._spool.write(dropped)
+                return
+            runtime = self._start()
 
+        # Never block the ES loop on its own backlog (elastic_transport logs from there)
+        can_block = threading.current_thread() is not runtime.thread
+        dropped = self._buffer.put(record.levelno, doc, can_block=can_block)
+        if dropped and self._spool:
+            self._spool.write(dropped)
 
-        # Schedule on dedicated ES logging thread (always available)
-        asyncio.run_coroutine_threadsafe(self._async_index(log), _es_loop)
+        if self._buffer.claim_wakeup(self.batch_size, self.batch_max_bytes):
+            runtime.loop.call_soon_threadsafe(self._wake_flusher)
 
-    async def _async_index(self, log: dict):
-        """Actually send the log to Elasticsearch 🔍"""
+    def flush(self):
+        """Block until everything buffered so far has been sent (or `flush_timeout` passes) 🚽"""
+        runtime = self._runtime
+        if not len(self._buffer) or runtime is None or not runtime.is_running():
+            return
+        future = runtime.submit(self._drain())
         try:
-            await es_client.index(index=settings.ES_INDEX, body=log)
+            future.result(self.flush_timeout)
+        except Exception as e:
+            future.cancel()
+            print(f"❌ Failed to flush logs to Elasticsearch: {e!r}", file=sys.stderr)
+
+    def close(self):
+        self.flush()
+        _handlers.discard(self)
+        if self._flusher:
+            self._flusher.cancel()
+        if self._replayer:
+            self._replayer.cancel()
+        if self._spool:
+            self._spool.close()
+        super().close()
+
+    def _start(self) -> _EsRuntime:
+        """Start (or restart, after a fork) the flusher/replayer on this process' ES loop."""
+        with self.lock:
+            runtime = _get_runtime()
+            if self._runtime is not runtime:
+                self._runtime = runtime
+                self._buffer.wakeup_done()
+                self._flusher = runtime.submit(self._run_flusher())
+                if self._spool:
+                    self._replayer = runtime.submit(self._run_replayer())
+        return runtime
+
+    def _after_fork_in_child(self):
+        """Drop what the parent had buffered (the parent ships it) and forget its loop."""
+        self._runtime = None
+        self._flusher = None
+        self._replayer = None
+        self.sent = 0
+        self.failed = 0
+        self._buffer.after_fork_in_child()
+        if self._spool:
+            self._spool.after_fork_in_child()
+
+    def _wake_flusher(self):
+        """Runs on the ES loop: nudge the flusher to send a full batch right away."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run_flusher(self):
+        """Flush on every wake-up (batch full) or every `flush_interval` seconds ⏱️"""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            self._buffer.wakeup_done()
+            await self._drain()
+
+    async def _drain(self):
+        """Send batches until the buffer is empty."""
+        while batch := self._buffer.take(self.batch_size, self.batch_max_bytes):
+            retry = await self._async_bulk(batch)
+            if retry and self._spool:
+                self._spool.write(retry)
+
+    async def _run_replayer(self):
+        """Ship spooled segments back to ES once it is reachable again 🔁"""
+        while True:
+            await asyncio.sleep(self.replay_interval)
+            try:
+                await self._replay_spool()
+            except Exception as e:
+                print(f"❌ Failed to replay spooled logs: {e!r}", file=sys.stderr)
+
+    async def _replay_spool(self):
+        if not self._spool.stats()['spool_segments']:
+            if not self._spool.open_bytes:
+                return
+            # Only cut the open segment short when ES looks healthy again,
+            # otherwise an outage would turn into lots of tiny segments.
+            if not self._es_available and not await self._runtime.client.ping():
+                return
+            self._spool.seal()
+
+        while path := self._spool.claim():
+            docs = self._spool.read(path)
+            for start in range(0, len(docs), self.batch_size):
+                if await self._async_bulk(docs[start:start + self.batch_size]):
+                    self._spool.release(path, done=False)
+                    return
+            self._spool.release(path, done=True, replayed=len(docs))
+
+    async def _async_bulk(self, batch: list[bytes]) -> list[bytes]:
+        """Actually send a batch of logs to Elasticsearch 🔍
+
+        Returns the documents that are worth retrying later.
+        """
+        body = b''.join(_BULK_ACTION + doc for doc in batch)
+        try:
+            response = await self._runtime.client.bulk(operations=body, index=get_frozen_settings().lookup('ES_INDEX'))
         except Exception as e:
             # Avoid recursive logging - print to stderr instead
-            print(f"❌ Failed to index log to Elasticsearch: {e}", file=sys.stderr)
+            print(f"❌ Failed to index {len(batch)} logs to Elasticsearch: {e}", file=sys.stderr)
+            self._es_available = False
+            self.failed += len(batch)
+            return batch
+
+        self._es_available = True
+        if not response.get('errors'):
+            self.sent += len(batch)
+            return []
+
+        retry = []
+        rejected = []
+        for doc, item in zip(batch, response['items']):
+            result = item['index']
+            if 'error' not in result:
+                continue
+            if result.get('status') in _RETRYABLE_STATUSES:
+                retry.append(doc)
+            else:
+                rejected.append(result)
+
+        self.failed += len(retry) + len(rejected)
+        self.sent += len(batch) - len(retry) - len(rejected)
+        if rejected:
+            print(f"❌ Elasticsearch rejected {len(rejected)}/{len(batch)} logs: "
+                  f"{rejected[0]['error']}", file=sys.stderr)
+        return retry
@@ -1,4 +1,8 @@
+import functools
 import logging
+import os
+import sys
+from collections import OrderedDict
 
 NORM = '\033[0m'
 BOLD = '\033[01m'
@@ -17,6 +21,20 @@ YELLOW = '\033[93m'
 
 
 class CustomFormatter(logging.Formatter):
+    """🎨 Colored console formatter, with a plain mode for non-TTY output.
+
+    `plain=None` (the default) picks plain mode when the handler's stream is
+    not a TTY (e.g. a container log collector), honouring `NO_COLOR` /
+    `FORCE_COLOR`. Until it is bound to a handler with `for_stream`, that is
+    `sys.stdout`. Plain mode emits no escape codes and never rewrites lines.
+
+    The line template is precomputed per level. Rendered tracebacks are kept
+    in an LRU cache keyed by everything the rendering shows (see
+    `_exception_key`), and colorized ones in an LRU cache keyed by the
+    traceback text, so retry storms that repeat one trace pay for rendering
+    it once.
+    """
+
     _name_colors = {
         logging.DEBUG: f'{BROWN}',
         logging.INFO: f'{BROWN}',
@@ -34,35 +52,71 @@ class CustomFormatter(logging.Formatter):
     }
     _msg_color = YELLOW
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, plain: bool | None = None, traceback_cache_size: int = 256, **kwargs):
         # Yaml parsing doesn't work properly with escape
         # chars for coloring. So The format is hard coded.
         # Any *args, **kwargs passed to the factory are ignored.
-        fmt = (f'{WHITE}%(asctime)s{NORM} '
-               f'%(level_emoji)s {NORM} '
-               f'[{DARK_GREEN}%(name)s{NORM}] '
-               f'{self._msg_color}%(message)s{NORM}')
+        self._auto_plain = plain is None
+        self.plain = _detect_plain() if plain is None else plain
+
+        if self.plain:
+            fmt = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+            level_fmts = {}
+        else:
+            fmt = (f'{WHITE}%(asctime)s{NORM} '
+                   f'%(levelname)s {NORM} '
+                   f'[{DARK_GREEN}%(name)s{NORM}] '
+                   f'{self._msg_color}%(message)s{NORM}')
+            level_fmts = {
+                level: fmt.replace('%(levelname)s', emoji)
+                for level, emoji in self._name_emojis.items()
+            }
         super().__init__(fmt=fmt, datefmt=None, style='%')
 
-    def format(self, record):
-        if record.exc_info:
-            exc_text = record.exc_text or self.formatException(record.exc_info)
-            record.exc_text = self.colorize_exception(exc_text)
-
-        record.name_color = self._name_colors[record.levelno]
-        record.level_emoji = self._name_emojis[record.levelno]
+        self._level_styles = {level: logging.PercentStyle(f) for level, f in level_fmts.items()}
+        self._colorize_cached = functools.lru_cache(maxsize=traceback_cache_size)(self.colorize_exception)
+        self._traceback_cache: OrderedDict[tuple, str] = OrderedDict()
+        self._traceback_cache_size = traceback_cache_size
 
-        msg = super().format(record)
+    def for_stream(self, stream) -> 'CustomFormatter':
+        """The formatter for a handler writing to `stream`: plain mode is detected against it."""
+        if not self._auto_plain or _detect_plain(stream) == self.plain:
+            return self
+        formatter = type(self)(plain=not self.plain, traceback_cache_size=self._traceback_cache_size)
+        formatter._auto_plain = True
+        return formatter
 
-        # Cleanup for following handlers
-        if record.exc_text:
+    def format(self, record):
+        if self.plain or not record.exc_info:
+            return super().format(record)
+
+        exc_text = record.exc_text or self.formatException(record.exc_info)
+        record.exc_text = self._colorize_cached(exc_text)
+        try:
+            return super().format(record)
+        finally:
+            # Cleanup for following handlers
             record.exc_text = exc_text
-        del record.name_color
 
-        return msg
+    def formatException(self, ei):
+        try:
+            key = _exception_key(ei[1])
+        except Exception:
+            return super().formatException(ei)
+
+        cache = self._traceback_cache
+        try:
+            cache.move_to_end(key)
+            return cache[key]
+        except KeyError:
+            pass
+        text = cache[key] = super().formatException(ei)
+        if len(cache) > self._traceback_cache_size:
+            cache.popitem(last=False)
+        return text
 
     def formatMessage(self, record):
-        msg = super().formatMessage(record)
+        msg = self._level_styles.get(record.levelno, self._style).format(record)
 
         # if ctx:
         #     context = f'    {NORM}Context({ctx})'
@@ -72,14 +126,10 @@ class CustomFormatter(logging.Formatter):
         #     else:
         #         msg += context
 
-        if '\n' in msg:
-            first, *others = msg.split('\n')
-            meta = self._extract_metadata(first)
-            msg = '\n'.join((
-                first,
-                *(f'{meta}{line}' for line in others),
-
-            ))
+        if not self.plain and '\n' in msg:
+            first, _, others = msg.partition('\n')
+            line_start = '\n' + self._extract_metadata(first)
+            msg = first + line_start + others.replace('\n', line_start)
         return msg
 
     def _extract_metadata(self, s):
@@ -135,4 +185,51 @@ class CustomFormatter(logging.Formatter):
                 txt[i] = (
                     line.replace('=', f'{GRAY}={NORM}')
                 )
-        return '\n'.join(txt)
\ No newline at end of file
+        return '\n'.join(txt)
+
+
+def _detect_plain(stream=None) -> bool:
+    """Plain output unless `stream` (stdout by default) is a terminal; `NO_COLOR` / `FORCE_COLOR` override."""
+    if os.environ.get('NO_COLOR'):
+        return True
+    if os.environ.get('FORCE_COLOR'):
+        return False
+    isatty = getattr(sys.stdout if stream is None else stream, 'isatty', None)
+    try:
+        return not (isatty and isatty())
+    except ValueError:
+        # Closed stream
+        return True
+
+
+def _exception_key(exc: BaseException) -> tuple:
+    """Identify a traceback without rendering it: everything `format_exception` shows.
+
+    That is, for the exception and each one it chains to (`__cause__` /
+    `__context__`, and the members of an `ExceptionGroup`): its type, message
+    and notes, the code locations of its traceback, and how it is chained.
+    """
+    seen = set()
+
+    def key_of(exc: BaseException | None) -> tuple | None:
+        if exc is None or id(exc) in seen:
+            return None
+        seen.add(id(exc))
+        frames = []
+        tb = exc.__traceback__
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            frames.append((code.co_filename, code.co_name, tb.tb_lineno, tb.tb_lasti))
+            tb = tb.tb_next
+        notes = getattr(exc, '__notes__', None)
+        members = getattr(exc, 'exceptions', None) if isinstance(exc, BaseExceptionGroup) else None
+        if exc.__cause__ is not None:
+            chained = ('cause', key_of(exc.__cause__))
+        elif exc.__context__ is not None and not exc.__suppress_context__:
+            chained = ('context', key_of(exc.__context__))
+        else:
+            chained = None
+        return (type(exc), str(exc), tuple(map(str, notes)) if isinstance(notes, (list, tuple)) else repr(notes),
+                tuple(frames), chained, tuple(key_of(member) for member in members or ()))
+
+    return key_of(exc)
@@ -4,17 +4,23 @@ import threading
 from logging import PlaceHolder, getLogger
 from logging.config import dictConfig
 
-from hephaestus.settings import settings
+from hephaestus.settings import get_frozen_settings
+from hephaestus.settings_watcher import MISSING, changes_under, start_settings_watcher, subscribe
 from hephaestus.helpers import nested_update
+from hephaestus.logging.formatters import CustomFormatter
+from hephaestus.logging.queue_logging import install_queue_handlers, stop_queue_listener
 
 logger = getLogger('hephaestus.logging')
 
+# Unsubscribes `apply_logging_changes` from settings hot reload
+_unsubscribe = None
+
 
 def init_logger():
-    logging_config = settings.logging.model_dump()
+    logging_config = get_frozen_settings().logging.model_dump()
 
     handlers = logging_config['handlers']
-    loggers = logging_config.get('loggers', {})
+    loggers = logging_config.setdefault('loggers', {})
 
     used_handlers = set(logging_config['root']['handlers'])
     for logger_ in loggers.values():
@@ -23,6 +29,53 @@ def init_logger():
         if more_handlers:
             used_handlers.update(more_handlers)
 
+    resolve_logger_levels(logging_config)
+
+    for handler in list(handlers):  # iterate over a shallow copy of dict keys
+        if handler not in used_handlers:
+            # Avoid configuring handlers that are not in use, to avoid
+            # files creation / sockets opening during handlers init.
+            del handlers[handler]
+
+    dictConfig(logging_config)
+    bind_formatters_to_streams()
+
+    queue_config = logging_config.get('queue') or {}
+    if queue_config.get('enabled'):
+        # Handlers now run on a listener thread, callers only enqueue
+        install_queue_handlers(
+            maxsize=queue_config.get('maxsize', 10000),
+            logger_names=[name for name, logger_ in loggers.items() if logger_.get('handlers')],
+        )
+    else:
+        stop_queue_listener()
+
+    global _unsubscribe
+    if _unsubscribe is None:
+        _unsubscribe = subscribe(apply_logging_changes)
+    reload_config = get_frozen_settings().get('settings_reload')
+    if reload_config and reload_config.get('enabled'):
+        start_settings_watcher(reload_config.get('interval'), reload_config.get('restart_in_child'))
+
+    logger.info(f"Logger configuration set.")
+
+
+def get_logger(name: str | None = None) -> logging.Logger:
+    """Shorthand for `logging.getLogger`, configured by `init_logger`."""
+    return getLogger(name)
+
+
+def bind_formatters_to_streams():
+    """Let each stream handler's `CustomFormatter` detect color support against that handler's stream."""
+    for name in logging.getHandlerNames():
+        handler = logging.getHandlerByName(name)
+        if isinstance(handler, logging.StreamHandler) and isinstance(handler.formatter, CustomFormatter):
+            handler.setFormatter(handler.formatter.for_stream(handler.stream))
+
+
+def resolve_logger_levels(logging_config):
+    """Fill in `logging_config['loggers']` with a level for every known logger."""
+    loggers = logging_config.setdefault('loggers', {})
     nested_update(loggers, parse_levels(logging_config['logger_levels']))
 
     default = logging_config['default_logger_level']
@@ -41,20 +94,68 @@ def init_logger():
                 loggers[name] = {'level': default}
             else:
                 loggers[name].setdefault('level', default)
+    return loggers
 
-    for handler in list(handlers):  # iterate over a shallow copy of dict keys
-        if handler not in used_handlers:
-            # Avoid configuring handlers that are not in use, to avoid
-            # files creation / sockets opening during handlers init.
-            del handlers[handler]
 
-    dictConfig(logging_config)
-    logger.info(f"Logger configuration set.")
+def apply_logging_changes(changes):
+    """🔥 Settings hot reload: update levels and handler options in place.
+
+    Level changes and handler options the handler can `reconfigure` are applied
+    to the live loggers/handlers, so e.g. the ES connection pool survives.
+    Anything structural (new handlers, formatters, handler lists...) re-runs
+    `init_logger`.
+    """
+    logging_changes = changes_under(changes, 'logging.')
+    if not logging_changes:
+        return
+
+    levels_changed = False
+    handler_options = {}
+    structural = []
+    for path, change in logging_changes.items():
+        section, _, rest = path.partition('.')
+        if section in ('logger_levels', 'default_logger_level'):
+            levels_changed = True
+        elif section in ('loggers', 'root') and path.endswith('.level') and not isinstance(change.new, dict):
+            levels_changed = True
+        elif section == 'handlers' and rest.count('.') == 1:
+            name, option = rest.split('.')
+            handler_options.setdefault(name, {})[option] = change.new
+        else:
+            structural.append(path)
+
+    for name, options in handler_options.items():
+        handler = logging.getHandlerByName(name)
+        try:
+            if handler is None or MISSING in options.values():
+                raise ValueError(f"handler {name!r} changed shape")
+            level = options.pop('level', None)
+            if options:
+                if not hasattr(handler, 'reconfigure'):
+                    raise ValueError(f"{type(handler).__name__} can't be reconfigured in place")
+                handler.reconfigure(**options)
+            if level is not None:
+                handler.setLevel(level)
+        except ValueError as e:
+            structural.append(f'handlers.{name} ({e})')
+
+    if structural:
+        logger.info(f"Re-applying logging configuration for: {', '.join(structural)}")
+        init_logger()
+        return
+
+    if levels_changed:
+        logging_config = get_frozen_settings().logging.model_dump()
+        for name, logger_ in resolve_logger_levels(logging_config).items():
+            if 'level' in logger_:
+                getLogger(name).setLevel(logger_['level'])
+        getLogger().setLevel(logging_config['root']['level'])
+    logger.info(f"Logging settings updated in place: {', '.join(logging_changes)}")
 
 
 def parse_levels(levels):
     levels = {level: loggers for level, loggers in levels.items() if loggers}
-    return {name: {'level': level}
+    return {name: {'level': level.upper()}
             for level, loggers in levels.items()
             for name in loggers}
 
@@ -0,0 +1,180 @@
+import logging
+import threading
+from collections import deque
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+BLOCK = 'block'
+LEVEL = 'level'
+
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK, LEVEL)
+
+
+class BoundedLogBuffer:
+    """🪣 Thread-safe FIFO of serialized log documents with a hard size cap.
+
+    When the buffer is full (`max_size` documents or `max_bytes` bytes), new
+    records are handled by `policy`:
+
+    - `drop_oldest`: evict the oldest buffered records to make room.
+    - `drop_newest`: reject the incoming record.
+    - `block`: wait up to `block_timeout` seconds for room, then reject.
+    - `level`: reject records below `overflow_level`; records at or above it
+      evict the oldest lower-level record (or the oldest record at all).
+
+    A document bigger than `max_bytes` on its own is always rejected.
+    `put` returns whatever was dropped so the caller can account for or spool it.
+    """
+
+    def __init__(self, max_size: int = 10000, max_bytes: int = 50 * 1024 * 1024,
+                 policy: str = DROP_OLDEST, block_timeout: float = 0.5,
+                 overflow_level: int | str = logging.WARNING):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {OVERFLOW_POLICIES}")
+
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.overflow_level = _level_number(overflow_level)
+
+        self._docs: deque[tuple[int, bytes]] = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        # Set while a wake-up of the consumer is in flight (see `claim_wakeup`)
+        self._wakeup_pending = False
+
+        # 📊 Counters
+        self.enqueued = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'queued': len(self._docs),
+            'queued_bytes': self._bytes,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+        }
+
+    def put(self, levelno: int, doc: bytes, can_block: bool = True) -> list[bytes]:
+        """Append a document, applying the overflow policy. Returns the dropped documents."""
+        dropped = []
+        with self._lock:
+            if len(doc) > self.max_bytes:
+                # It would never fit: don't evict (or wait for) anything on its behalf
+                self.dropped += 1
+                return [doc]
+
+            if self.policy == BLOCK and can_block and self._is_full(len(doc)):
+                self._not_full.wait_for(lambda: not self._is_full(len(doc)), self.block_timeout)
+
+            if self._is_full(len(doc)):
+                if self.policy == DROP_OLDEST:
+                    while self._docs and self._is_full(len(doc)):
+                        dropped.append(self._popleft())
+                elif self.policy == LEVEL and levelno >= self.overflow_level:
+                    while self._docs and self._is_full(len(doc)):
+                        dropped.append(self._evict_below(self.overflow_level))
+                else:
+                    self.dropped += 1
+                    return [doc]
+
+            self._docs.append((levelno, doc))
+            self._bytes += len(doc)
+            self.enqueued += 1
+            self.dropped += len(dropped)
+        return dropped
+
+    def claim_wakeup(self, min_count: int, min_bytes: int) -> bool:
+        """True if the buffer holds a full batch and no wake-up is pending yet (the caller sends it)."""
+        with self._lock:
+            if self._wakeup_pending or (len(self._docs) < min_count and self._bytes < min_bytes):
+                return False
+            self._wakeup_pending = True
+            return True
+
+    def wakeup_done(self):
+        """The consumer woke up: the next full batch may claim a wake-up again."""
+        with self._lock:
+            self._wakeup_pending = False
+
+    def take(self, max_count: int, max_bytes: int) -> list[bytes]:
+        """Pop up to `max_count` documents / `max_bytes` bytes off the front."""
+        batch = []
+        size = 0
+        with self._lock:
+            while self._docs and len(batch) < max_count:
+                doc_size = len(self._docs[0][1])
+                if batch and size + doc_size > max_bytes:
+                    break
+                batch.append(self._popleft())
+                size += doc_size
+            if batch:
+                self._not_full.notify_all()
+        return batch
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._bytes = 0
+            self._not_full.notify_all()
+
+    def reconfigure(self, max_size: int | None = None, max_bytes: int | None = None,
+                    policy: str | None = None, block_timeout: float | None = None,
+                    overflow_level: int | str | None = None):
+        """Change limits/policy in place; buffered documents are kept."""
+        if policy is not None and policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {OVERFLOW_POLICIES}")
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if policy is not None:
+                self.policy = policy
+            if block_timeout is not None:
+                self.block_timeout = block_timeout
+            if overflow_level is not None:
+                self.overflow_level = _level_number(overflow_level)
+            self._not_full.notify_all()
+
+    def after_fork_in_child(self):
+        """Start empty with fresh locks: the parent ships what it had buffered."""
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._docs.clear()
+        self._bytes = 0
+        self._wakeup_pending = False
+        self.enqueued = 0
+        self.dropped = 0
+
+    def _is_full(self, incoming: int) -> bool:
+        return len(self._docs) >= self.max_size or self._bytes + incoming > self.max_bytes
+
+    def _popleft(self) -> bytes:
+        _, doc = self._docs.popleft()
+        self._bytes -= len(doc)
+        return doc
+
+    def _evict_below(self, level: int) -> bytes:
+        """Remove the oldest document below `level`, or the oldest document if none is."""
+        for i, (levelno, doc) in enumerate(self._docs):
+            if levelno < level:
+                del self._docs[i]
+                self._bytes -= len(doc)
+                return doc
+        return self._popleft()
+
+
+def _level_number(level: int | str) -> int:
+    if isinstance(level, int):
+        return level
+    return logging.getLevelNamesMapping()[level.upper()]
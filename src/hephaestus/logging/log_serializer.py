@@ -0,0 +1,95 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Mapping
+
+try:
+    import orjson
+except ImportError:  # orjson ships with langsmith, but stay usable without it
+    orjson = None
+
+# Projections are cached per record shape; `extra=` keys can make shapes unbounded
+_MAX_SHAPES = 256
+
+
+def _json_encoder() -> Callable[[dict], bytes]:
+    """Return a function that encodes a dict straight to one NDJSON line (bytes)."""
+    if orjson is not None:
+        options = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+        def encode(log: dict) -> bytes:
+            return orjson.dumps(log, default=str, option=options)
+
+        return encode
+
+    encoder = json.JSONEncoder(default=str, ensure_ascii=False, separators=(',', ':'))
+
+    def encode(log: dict) -> bytes:
+        return (encoder.encode(log) + '\n').encode()
+
+    return encode
+
+
+class RecordSerializer:
+    """⚡ Turns a `LogRecord` into one NDJSON line ready for a `_bulk` body.
+
+    - The (source key -> document key) projection is computed once per record
+      shape (the tuple of `record.__dict__` keys) and reused afterwards.
+    - The ISO-8601 timestamp prefix is cached per second; only the microseconds
+      are formatted per record.
+    - Nothing is run through a `Formatter`: the message is `record.getMessage()`,
+      and the traceback is only rendered when the record carries `exc_info`.
+    """
+
+    def __init__(self, ignore: Iterable[str], rename: Mapping[str, str],
+                 exc_formatter: logging.Formatter | None = None):
+        # `message` and `exc_text` are filled in explicitly, never copied from the record
+        self._ignore = frozenset(ignore) | {'message', 'exc_text'}
+        self._rename = dict(rename)
+        self._message_key = self._rename.get('message', 'message')
+        self._traceback_key = self._rename.get('exc_text', 'exc_text')
+        self.exc_formatter = exc_formatter or logging.Formatter()
+
+        self._projections: dict[tuple[str, ...], tuple[tuple[str, str], ...]] = {}
+        self._timestamp_cache: tuple[int, str] = (-1, '')
+        self._encode = _json_encoder()
+
+    def serialize(self, record: logging.LogRecord) -> bytes:
+        fields = record.__dict__
+        shape = tuple(fields)
+        projection = self._projections.get(shape)
+        if projection is None:
+            projection = self._compile(shape)
+
+        log = {target: fields[source] for source, target in projection}
+        log[self._message_key] = record.getMessage()
+        log[self._traceback_key] = self._traceback(record)
+        log['@timestamp'] = self._timestamp(record.created)
+        return self._encode(log)
+
+    def _compile(self, shape: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+        projection = tuple(
+            (key, self._rename.get(key, key))
+            for key in shape
+            if key not in self._ignore
+        )
+        if len(self._projections) >= _MAX_SHAPES:
+            self._projections.clear()
+        self._projections[shape] = projection
+        return projection
+
+    def _traceback(self, record: logging.LogRecord) -> str | None:
+        if record.exc_info and not record.exc_text:
+            # Cache it on the record like `Formatter.format` does, for the other handlers
+            record.exc_text = self.exc_formatter.formatException(record.exc_info)
+        return record.exc_text
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        cached_second, prefix = self._timestamp_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+            # One tuple assignment, so concurrent emitters never see a torn cache
+            self._timestamp_cache = (second, prefix)
+        return f'{prefix}.{int((created - second) * 1_000_000):06d}+00:00'
+
@@ -0,0 +1,165 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+_SEALED = '.ndjson'
+_OPEN = '.ndjson.open'
+_REPLAYING = '.ndjson.replaying-'
+
+
+class DiskSpool:
+    """💾 Append-only, size-capped segment files for log documents ES could not take.
+
+    Documents are appended (buffered writes) to an open segment named
+    `<time_ns>-<pid>.ndjson.open`. Once it reaches `segment_max_bytes` it is
+    sealed (renamed to `.ndjson`) and a new one is started. At most
+    `max_segments` sealed segments are kept - the oldest is deleted first.
+
+    A replayer claims the oldest sealed segment by renaming it to
+    `.ndjson.replaying-<pid>`, ships it, then deletes it (or renames it back
+    if shipping failed). Renames are atomic, so several processes can share a
+    spool directory without sending a segment twice. Delivery is at least once:
+    a segment that fails halfway is replayed again from the start.
+    """
+
+    def __init__(self, directory: str | os.PathLike, segment_max_bytes: int = 16 * 1024 * 1024,
+                 max_segments: int = 64):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._path: Path | None = None
+        self._size = 0
+
+        # 📊 Counters
+        self.spooled = 0
+        self.replayed = 0
+        self.segments_dropped = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'spooled': self.spooled,
+            'replayed': self.replayed,
+            'spool_segments': len(self._sealed_segments()),
+            'spool_segments_dropped': self.segments_dropped,
+        }
+
+    @property
+    def open_bytes(self) -> int:
+        """Bytes written to the open (not yet sealed) segment."""
+        return self._size
+
+    def write(self, docs: list[bytes]):
+        """Append newline-terminated documents to the open segment."""
+        if not docs:
+            return
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            for doc in docs:
+                self._file.write(doc)
+                self._size += len(doc)
+            self._file.flush()  # Hand it to the OS, so a crash of this process loses nothing
+            self.spooled += len(docs)
+            if self._size >= self.segment_max_bytes:
+                self._seal_segment()
+
+    def seal(self):
+        """Seal the open segment (if it has anything in it) so it can be replayed."""
+        with self._lock:
+            if self._file is not None and self._size:
+                self._seal_segment()
+
+    def claim(self) -> Path | None:
+        """Claim the oldest sealed segment for replay, or return None if there is none."""
+        self._recover_orphans()
+        for path in self._sealed_segments():
+            claimed = path.with_name(path.name[:-len(_SEALED)] + f'{_REPLAYING}{os.getpid()}')
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue  # Another process got there first
+            return claimed
+        return None
+
+    @staticmethod
+    def read(path: Path) -> list[bytes]:
+        with open(path, 'rb') as f:
+            return [line for line in f if line.strip()]
+
+    def release(self, path: Path, done: bool, replayed: int = 0):
+        """Delete a claimed segment once shipped, or hand it back for a later retry."""
+        if done:
+            path.unlink(missing_ok=True)
+            self.replayed += replayed
+        else:
+            path.rename(path.with_name(path.name[:path.name.index(_REPLAYING)] + _SEALED))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._seal_segment()
+
+    def after_fork_in_child(self):
+        """Leave the parent's open segment to the parent and start our own on the next write."""
+        self._lock = threading.Lock()
+        if self._file is not None:
+            self._file.close()  # Only closes the child's copy of the descriptor
+        self._file = None
+        self._path = None
+        self._size = 0
+
+    def _open_segment(self):
+        self._path = self.directory / f'{time.time_ns():020d}-{os.getpid()}{_OPEN}'
+        self._file = open(self._path, 'ab')
+        self._size = 0
+
+    def _seal_segment(self):
+        self._file.close()
+        self._path.rename(self._path.with_name(self._path.name[:-len(_OPEN)] + _SEALED))
+        self._file = None
+        self._path = None
+        self._size = 0
+        self._enforce_max_segments()
+
+    def _sealed_segments(self) -> list[Path]:
+        return sorted(self.directory.glob(f'*{_SEALED}'))
+
+    def _enforce_max_segments(self):
+        segments = self._sealed_segments()
+        for path in segments[:max(0, len(segments) - self.max_segments)]:
+            path.unlink(missing_ok=True)
+            self.segments_dropped += 1
+            print(f"⚠️ Log spool is full, dropped segment {path.name}", file=sys.stderr)
+
+    def _recover_orphans(self):
+        """Hand segments left open/claimed by dead processes back to the replay queue."""
+        for path in self.directory.glob('*.ndjson.*'):
+            name = path.name
+            if name.endswith(_OPEN):
+                base = name[:-len(_OPEN)]
+                pid = base.rsplit('-', 1)[-1]
+            elif _REPLAYING in name:
+                base, pid = name.split(_REPLAYING)
+            else:
+                continue
+            if int(pid) != os.getpid() and not _pid_alive(int(pid)):
+                try:
+                    path.rename(path.with_name(base + _SEALED))
+                except FileNotFoundError:
+                    pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,97 @@
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger('hephaestus.logging')
+
+_listener: "RoutingQueueListener | None" = None
+
+
+class RoutingQueueHandler(QueueHandler):
+    """📨 Stands in for a logger's real handlers: records are only enqueued.
+
+    Each logger keeps its own set of `targets`, and every queued item carries
+    them along, so one listener thread can serve all loggers. Unlike the stdlib
+    `QueueHandler`, nothing is formatted here and `exc_info` is kept, so
+    formatters behind the queue still see the original traceback.
+    If the queue is full, the record is handled on the calling thread rather
+    than dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue, targets: list[logging.Handler]):
+        super().__init__(log_queue)
+        self.targets = tuple(targets)
+
+    def prepare(self, record):
+        # Merge args now: they may be mutated by the caller before the listener runs.
+        # Work on a copy, other handlers of the logger still get the record as it was.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait((self.targets, record))
+        except queue.Full:
+            _handle(self.targets, record)
+
+
+class RoutingQueueListener(QueueListener):
+    """🧵 Single thread that hands queued records to the handlers they were routed to."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue, respect_handler_level=True)
+
+    def handle(self, item):
+        targets, record = item
+        _handle(targets, record)
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def _handle(targets: tuple[logging.Handler, ...], record: logging.LogRecord):
+    for handler in targets:
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+def install_queue_handlers(maxsize: int = 10000, logger_names=()) -> RoutingQueueListener:
+    """🔀 Move the handlers of root (and of `logger_names`) behind one queue + listener thread.
+
+    Application threads and coroutines then only pay for an enqueue per log
+    call; formatting and I/O happen on the listener thread.
+    """
+    stop_queue_listener()
+
+    log_queue = queue.Queue(maxsize)
+    for name in (None, *logger_names):
+        logger_ = logging.getLogger(name)
+        targets = [h for h in logger_.handlers if not isinstance(h, RoutingQueueHandler)]
+        if not targets:
+            continue
+        for handler in targets:
+            logger_.removeHandler(handler)
+        logger_.addHandler(RoutingQueueHandler(log_queue, targets))
+
+    global _listener
+    _listener = RoutingQueueListener(log_queue)
+    _listener.start()
+
+    # atexit runs hooks last-in-first-out: (re)registering after the handlers
+    # were built makes the queue drain before e.g. ElasticHandler's final flush.
+    atexit.unregister(stop_queue_listener)
+    atexit.register(stop_queue_listener)
+    return _listener
+
+
+def stop_queue_listener():
+    """Drain the queue and stop the listener thread (also runs at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
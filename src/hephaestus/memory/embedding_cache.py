@@ -0,0 +1,255 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class EmbeddingStore:
+    """💽 Append-only, memory-mapped store of float32 vectors keyed by a sha256 digest.
+
+    One directory per model:
+    - `vectors.f32`: the vectors, one `dim`-wide float32 row each (memory-mapped)
+    - `keys.bin`: the 32-byte digest of each row, in row order
+    - `meta.json`: the vector width and the number of committed rows
+
+    Rows are only ever appended, under an exclusive `flock`: vectors and
+    digests first, then the row count in `meta.json` (replaced atomically).
+    A row exists once it is counted, so a crash mid-append only leaves bytes
+    past the committed rows, which are truncated away on open and overwritten
+    by the next append. Processes sharing the directory pick up each other's
+    rows on the next miss.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._keys_path = self.path / 'keys.bin'
+        self._vectors_path = self.path / 'vectors.f32'
+        self._meta_path = self.path / 'meta.json'
+        self._lock_path = self.path / '.lock'
+
+        self.dim: int | None = None
+        self._rows: dict[bytes, int] = {}
+        self._vectors: np.ndarray | None = None
+        self._thread_lock = threading.Lock()
+        with self._file_lock():
+            self._truncate(self._committed_rows())
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_many(self, digests: list[bytes]) -> list[np.ndarray | None]:
+        with self._thread_lock:
+            if any(digest not in self._rows for digest in digests):
+                # Another process may have embedded them in the meantime
+                self._refresh()
+            return [self._row(digest) for digest in digests]
+
+    def put_many(self, digests: list[bytes], vectors: list[list[float]]):
+        if not digests:
+            return
+        array = np.asarray(vectors, dtype=np.float32)
+        with self._thread_lock, self._file_lock():
+            self._refresh()
+            if self.dim is None:
+                self.dim = array.shape[1]
+            elif array.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {array.shape[1]}")
+
+            new = {}
+            for digest, vector in zip(digests, array):
+                if digest not in self._rows and digest not in new:
+                    new[digest] = vector
+            if not new:
+                return
+
+            # Overwrite whatever an interrupted append left past the committed rows
+            rows = len(self._rows)
+            _write_at(self._vectors_path, rows * self.dim * 4, np.stack(list(new.values())).tobytes())
+            _write_at(self._keys_path, rows * _DIGEST_SIZE, b''.join(new))
+            self._write_meta(rows + len(new))
+            self._refresh()
+
+    def _row(self, digest: bytes) -> np.ndarray | None:
+        row = self._rows.get(digest)
+        if row is None:
+            return None
+        return np.array(self._vectors[row])
+
+    def _committed_rows(self) -> int:
+        """Rows recorded in `meta.json` (and its `dim`, loaded on the way)."""
+        if not self._meta_path.exists():
+            return 0
+        meta = json.loads(self._meta_path.read_text())
+        self.dim = meta['dim']
+        if 'rows' in meta:
+            return meta['rows']
+        # Written before the row count was recorded: complete rows of both files
+        vector_rows = self._vectors_path.stat().st_size // (self.dim * 4) if self._vectors_path.exists() else 0
+        key_rows = self._keys_path.stat().st_size // _DIGEST_SIZE if self._keys_path.exists() else 0
+        return min(vector_rows, key_rows)
+
+    def _write_meta(self, rows: int):
+        tmp_path = self._meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'dim': self.dim, 'rows': rows}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._meta_path)
+
+    def _truncate(self, rows: int):
+        """Drop what an interrupted append left past `rows` (under the file lock)."""
+        if self.dim is None:
+            return
+        for path, size in ((self._keys_path, rows * _DIGEST_SIZE), (self._vectors_path, rows * self.dim * 4)):
+            if path.exists() and path.stat().st_size > size:
+                logger.warning(f"Truncating {path} to {rows} rows, left over by an interrupted append")
+                os.truncate(path, size)
+
+    def _refresh(self):
+        """Load the digests (and remap the vectors) committed since the last refresh."""
+        key_rows = self._committed_rows()
+        if key_rows <= len(self._rows):
+            return
+
+        with open(self._keys_path, 'rb') as f:
+            f.seek(len(self._rows) * _DIGEST_SIZE)
+            data = f.read((key_rows - len(self._rows)) * _DIGEST_SIZE)
+        for offset in range(0, len(data), _DIGEST_SIZE):
+            self._rows.setdefault(data[offset:offset + _DIGEST_SIZE], len(self._rows))
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(key_rows, self.dim))
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._lock_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_at(path: Path, offset: int, data: bytes):
+    """Write `data` at `offset`, drop anything past it and fsync."""
+    with open(path, 'r+b' if path.exists() else 'wb') as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class CachedEmbeddings(Embeddings):
+    """🧮 Embeddings wrapper that never embeds the same text twice.
+
+    Vectors are cached on disk in an `EmbeddingStore` under
+    `cache_dir/<model_name>`, keyed by the sha256 of the text (documents and
+    queries separately, as some models embed them differently). Misses are
+    deduplicated and sent to `inner` in batches of `batch_size`.
+
+    Plugs in wherever a LangChain `Embeddings` does: Chroma's
+    `embedding_function` and mem0's `langchain` embedder. Hit/miss counters
+    are in `stats()`.
+    """
+
+    def __init__(self, inner: Embeddings, model_name: str, cache_dir: str | os.PathLike,
+                 batch_size: int = 64):
+        self.inner = inner
+        self.model_name = model_name
+        self.batch_size = batch_size
+        safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in model_name)
+        self.store = EmbeddingStore(Path(cache_dir) / safe_name)
+
+        # 📊 Counters
+        self.hits = 0
+        self.misses = 0
+        self.embed_calls = 0
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'embed_calls': self.embed_calls,
+            'entries': len(self.store),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors, missing = self._lookup(texts, 'document')
+        if missing:
+            embedded = []
+            for batch in self._batches(list(missing)):
+                self.embed_calls += 1
+                embedded.extend(self.inner.embed_documents(batch))
+            fresh = self._store(missing, embedded)
+            vectors = [list(fresh[text]) if vector is None else vector for text, vector in zip(texts, vectors)]
+        return vectors
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        # The store reads, refreshes (flock, mmap) and writes files: all of it off the event loop
+        vectors, missing = await asyncio.to_thread(self._lookup, texts, 'document')
+        if missing:
+            embedded = []
+            for batch in self._batches(list(missing)):
+                self.embed_calls += 1
+                embedded.extend(await self.inner.aembed_documents(batch))
+            fresh = await asyncio.to_thread(self._store, missing, embedded)
+            vectors = [list(fresh[text]) if vector is None else vector for text, vector in zip(texts, vectors)]
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        (vector,), missing = self._lookup([text], 'query')
+        if vector is not None:
+            return vector
+        self.embed_calls += 1
+        vector = self.inner.embed_query(text)
+        self._store(missing, [vector])
+        return vector
+
+    async def aembed_query(self, text: str) -> list[float]:
+        (vector,), missing = await asyncio.to_thread(self._lookup, [text], 'query')
+        if vector is not None:
+            return vector
+        self.embed_calls += 1
+        vector = await self.inner.aembed_query(text)
+        await asyncio.to_thread(self._store, missing, [vector])
+        return vector
+
+    def _digest(self, text: str, kind: str) -> bytes:
+        return hashlib.sha256(f'{self.model_name}\0{kind}\0{text}'.encode()).digest()
+
+    def _lookup(self, texts: list[str], kind: str) -> tuple[list[list[float] | None], dict[str, bytes]]:
+        """Cached vectors (None for misses), and the distinct missing texts with their digests."""
+        digests = [self._digest(text, kind) for text in texts]
+        vectors = [None if row is None else row.tolist() for row in self.store.get_many(digests)]
+        missing = {text: digest for text, digest, vector in zip(texts, digests, vectors) if vector is None}
+        misses = sum(vector is None for vector in vectors)
+        self.hits += len(texts) - misses
+        self.misses += misses
+        return vectors, missing
+
+    def _store(self, missing: dict[str, bytes], embedded: list[list[float]]) -> dict[str, list[float]]:
+        """Persist freshly embedded vectors; returns them by text."""
+        try:
+            self.store.put_many(list(missing.values()), embedded)
+        except OSError as e:
+            logger.warning(f"Failed to persist {len(embedded)} embeddings: {e}")
+        return dict(zip(missing, embedded))
+
+    def _batches(self, texts: list[str]):
+        for start in range(0, len(texts), self.batch_size):
+            yield texts[start:start + self.batch_size]
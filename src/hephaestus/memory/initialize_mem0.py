@@ -1,26 +1,80 @@
-import asyncio
 import os
-
-from mem0 import AsyncMemory
-from mem0.configs.base import MemoryConfig, RerankerConfig, VectorStoreConfig, EmbedderConfig, LlmConfig
-from langchain_ollama import OllamaEmbeddings
-from langchain_chroma import Chroma
-from langchain import BaseChatModel
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
 
 persistent_path = Path(os.getcwd()) / "persistent_mem0"
-persistent_path.mkdir(parents=True, exist_ok=True)
+EMBEDDING_MODEL = "mxbai-embed-large"
+
+
+@cache
+def get_embeddings():
+    """🧮 Ollama embeddings, created on first use.
+
+    Wrapped in a `CachedEmbeddings` disk cache unless `embedding_cache.enabled`
+    is off, so Chroma and mem0 never re-embed text they have seen before.
+    """
+    from langchain_ollama import OllamaEmbeddings
+    from hephaestus.settings import get_frozen_settings
+
+    embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
+    cache_config = get_frozen_settings().embedding_cache
+    if not cache_config.enabled:
+        return embeddings
 
-embeddings = OllamaEmbeddings(model="mxbai-embed-large")
+    from hephaestus.memory.embedding_cache import CachedEmbeddings
+    return CachedEmbeddings(
+        embeddings,
+        model_name=EMBEDDING_MODEL,
+        cache_dir=cache_config.get('path') or persistent_path / "embedding_cache",
+        batch_size=cache_config.batch_size,
+    )
+
+
+@cache
+def get_vector_store():
+    """Chroma store persisted under `persistent_path`, created on first use."""
+    from langchain_chroma import Chroma
+
+    persistent_path.mkdir(parents=True, exist_ok=True)
+    # ✅ Chroma supports in-memory mode and dict-based filters (officially supported by mem0)
+    return Chroma(
+        collection_name="mem0_memories",
+        embedding_function=get_embeddings(),
+        persist_directory=persistent_path
+    )
 
-# ✅ Chroma supports in-memory mode and dict-based filters (officially supported by mem0)
-vector_store = Chroma(
-    collection_name="mem0_memories",
-    embedding_function=embeddings,
-    persist_directory=persistent_path
-)
 
-async def _setup_memory(model: BaseChatModel):
+_LAZY_ATTRIBUTES = {
+    'embeddings': get_embeddings,
+    'vector_store': get_vector_store,
+}
+
+
+def __getattr__(name):
+    # Keeps `from hephaestus.memory.initialize_mem0 import vector_store` working
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def _setup_memory(model: "BaseChatModel"):
+    """The shared memory of `model`, see `hephaestus.memory.registry.get_memory`."""
+    from hephaestus.memory.registry import get_memory
+    return await get_memory(model)
+
+
+def _build_memory(model: "BaseChatModel"):
+    """A new `AsyncMemory` for `model` on the shared vector store, embedder and reranker weights."""
+    from mem0 import AsyncMemory
+    from mem0.configs.base import MemoryConfig, RerankerConfig, VectorStoreConfig, EmbedderConfig, LlmConfig
+    from hephaestus.memory import reranker
+    from hephaestus.settings import get_frozen_settings
+
+    reranker.register()
 
     config = MemoryConfig(
         llm=LlmConfig(
@@ -32,23 +86,20 @@ async def _setup_memory(model: BaseChatModel):
         vector_store=VectorStoreConfig(
             provider="langchain",
             config={
-                "client": vector_store,
+                "client": get_vector_store(),
             }
         ),
         embedder=EmbedderConfig(
             provider="langchain",
             config={
-                "model": embeddings,
+                "model": get_embeddings(),
             }
         ),
         reranker=RerankerConfig(
-            provider="huggingface",
-            config={
-                "model": "BAAI/bge-reranker-large",
-                "device": "cuda",
-                "top_n": 15  # 🎯 Set to highest limit needed (for DM)
-            }),
+            provider=reranker.PROVIDER,
+            config=get_frozen_settings().reranker.model_dump(),
+        ),
     )
 
     memory = AsyncMemory(config=config)
-
+    return memory
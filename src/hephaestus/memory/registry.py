@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from hephaestus.settings import get_frozen_settings
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from mem0 import AsyncMemory
+
+logger = logging.getLogger(__name__)
+
+
+def model_key(model: "BaseChatModel") -> str:
+    """Identifies a chat model by class and identifying params (model name, temperature...)."""
+    params = getattr(model, '_identifying_params', None) or {}
+    return f'{type(model).__name__}:' + json.dumps(params, sort_keys=True, default=str)
+
+
+class PooledMemory:
+    """🧠 A registry-owned `AsyncMemory`: every coroutine method goes through the registry's concurrency limit.
+
+    Use it like the `AsyncMemory` it wraps (`await memory.add(...)`,
+    `await memory.search(...)`); the wrapped instance is `memory.memory`.
+    """
+
+    def __init__(self, memory: "AsyncMemory", registry: 'MemoryRegistry'):
+        self.memory = memory
+        self._registry = registry
+        self.in_flight = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self.memory, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def limited(*args, **kwargs):
+            self.in_flight += 1
+            try:
+                async with self._registry.limiter:
+                    return await attribute(*args, **kwargs)
+            finally:
+                self.in_flight -= 1
+
+        return limited
+
+
+class MemoryRegistry:
+    """🗂️ One warm `AsyncMemory` per chat model, shared by every request.
+
+    Instances are built on first use (off the event loop: building one loads
+    the reranker and adapters) and kept in LRU order. Beyond `max_instances`,
+    the least recently used idle ones are dropped. The vector store, embedder
+    and reranker weights are process-wide and shared by all instances.
+
+    At most `max_concurrency` memory calls run at once across all instances
+    (per event loop), to protect Ollama and Chroma. Defaults come from
+    `settings.memory_pool`.
+    """
+
+    def __init__(self, max_instances: int | None = None, max_concurrency: int | None = None):
+        defaults = get_frozen_settings().memory_pool
+        self.max_instances = defaults.max_instances if max_instances is None else max_instances
+        self.max_concurrency = defaults.max_concurrency if max_concurrency is None else max_concurrency
+        self._instances: OrderedDict[str, PooledMemory] = OrderedDict()
+        self._lock = threading.Lock()
+        # asyncio primitives are bound to one event loop
+        self._limiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._build_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # 📊 Counters
+        self.builds = 0
+        self.evictions = 0
+
+    @property
+    def limiter(self) -> asyncio.Semaphore:
+        """The running loop's concurrency limit."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            limiter = self._limiters.get(loop)
+            if limiter is None:
+                limiter = self._limiters[loop] = asyncio.Semaphore(self.max_concurrency)
+        return limiter
+
+    def stats(self) -> dict[str, int]:
+        return {'instances': len(self._instances), 'builds': self.builds, 'evictions': self.evictions}
+
+    async def get(self, model: "BaseChatModel", key: str | None = None) -> PooledMemory:
+        """The memory of `model` (or of `key`, when given), built on first use."""
+        key = key or model_key(model)
+        memory = self._lookup(key)
+        if memory is not None:
+            return memory
+
+        with self._lock:
+            locks = self._build_locks.setdefault(asyncio.get_running_loop(), {})
+            build_lock = locks.setdefault(key, asyncio.Lock())
+        async with build_lock:
+            memory = self._lookup(key)
+            if memory is None:
+                from hephaestus.memory.initialize_mem0 import _build_memory
+
+                logger.info(f"Building memory for {key}")
+                memory = PooledMemory(await asyncio.to_thread(_build_memory, model), self)
+                with self._lock:
+                    self._instances[key] = memory
+                    self.builds += 1
+                    self._evict()
+        return memory
+
+    async def warmup(self, *models: "BaseChatModel"):
+        """Load what the first request would otherwise pay for, at process start.
+
+        Celery workers run it on their worker loop as each process starts
+        (`memory_pool.warmup_on_worker_start`); other apps await it at startup.
+
+        Always warms the shared embedder, vector store and reranker weights;
+        also builds the memory of each of `models`.
+        """
+        from hephaestus.memory import initialize_mem0, reranker
+
+        start = time.perf_counter()
+        try:
+            embeddings = await asyncio.to_thread(initialize_mem0.get_embeddings)
+            await asyncio.to_thread(initialize_mem0.get_vector_store)
+            await embeddings.aembed_query('warmup')
+        except Exception as e:
+            logger.warning(f"Failed to warm up the embedder: {e}")
+        try:
+            reranker_config = reranker.BudgetedRerankerConfig(**get_frozen_settings().reranker.model_dump())
+            await asyncio.to_thread(reranker.load_cross_encoder, reranker_config.model,
+                                    reranker.resolve_device(reranker_config.device))
+        except Exception as e:
+            logger.warning(f"Failed to warm up the reranker: {e}")
+        for model in models:
+            await self.get(model)
+        logger.info(f"Memory warmed up in {time.perf_counter() - start:.1f}s")
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+    def _lookup(self, key: str) -> PooledMemory | None:
+        with self._lock:
+            memory = self._instances.get(key)
+            if memory is not None:
+                self._instances.move_to_end(key)
+        return memory
+
+    def _evict(self):
+        # Oldest first, skipping instances with calls in flight
+        for key in list(self._instances):
+            if len(self._instances) <= self.max_instances:
+                return
+            if self._instances[key].in_flight == 0:
+                del self._instances[key]
+                self.evictions += 1
+                logger.debug(f"Evicted memory for {key}")
+
+
+memory_registry = MemoryRegistry()
+
+
+async def get_memory(model: "BaseChatModel", key: str | None = None) -> PooledMemory:
+    """🧠 The shared, warm memory of `model` (see `MemoryRegistry`)."""
+    return await memory_registry.get(model, key)
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from typing import Any
+
+from mem0.configs.rerankers.huggingface import HuggingFaceRerankerConfig
+from mem0.reranker.base import BaseReranker
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+PROVIDER = "hephaestus"
+
+# 🏋️ Cross-encoders loaded in this process, by (model, device)
+_models: dict[tuple[str, str], tuple[Any, Any]] = {}
+_models_lock = threading.Lock()
+
+
+class BudgetedRerankerConfig(HuggingFaceRerankerConfig):
+    """Config of `BudgetedReranker` (mem0 reranker provider `"hephaestus"`)."""
+
+    device: str | None = Field(default="auto", description="'auto' (cuda when available), 'cpu', 'cuda', ...")
+    prefilter: int = Field(default=30, description="Only the top N vector hits are scored")
+    cpu_batch_size: int = Field(default=8, description="Batch size when running on CPU")
+    latency_budget: float | None = Field(default=None, description="Seconds; fall back to vector order beyond it")
+
+
+def resolve_device(device: str | None) -> str:
+    if device in (None, "auto"):
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    return device
+
+
+def load_cross_encoder(model_name: str, device: str):
+    """Tokenizer and model of `model_name` on `device`, loaded once per process."""
+    key = (model_name, device)
+    with _models_lock:
+        if key not in _models:
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+            logger.info(f"Loading reranker {model_name} on {device}")
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            model.to(device)
+            model.eval()
+            _models[key] = (tokenizer, model)
+        return _models[key]
+
+
+class BudgetedReranker(BaseReranker):
+    """⚖️ Cross-encoder reranker with predictable latency, for CPU-only hosts too.
+
+    - `device: auto` picks CUDA when available, CPU otherwise (with `cpu_batch_size`).
+    - Only the first `prefilter` documents (mem0 passes them in vector order)
+      are scored. The rest keep their vector order behind them.
+    - With a `latency_budget` (seconds), reranking is skipped when the
+      measured cost per document says it won't fit (documents come back in
+      vector order), or cut short once it runs over: the documents scored so
+      far are ranked, the rest keep their vector order behind them.
+    - Weights are loaded once per process and shared by every instance.
+    """
+
+    def __init__(self, config: BudgetedRerankerConfig | dict):
+        if isinstance(config, dict):
+            config = BudgetedRerankerConfig(**config)
+        elif not isinstance(config, BudgetedRerankerConfig):
+            config = BudgetedRerankerConfig(**config.model_dump(exclude_none=True))
+        self.config = config
+        self.device = resolve_device(config.device)
+        self.batch_size = config.cpu_batch_size if self.device == "cpu" else config.batch_size
+        self.tokenizer, self.model = load_cross_encoder(config.model, self.device)
+
+        # Moving average of the seconds it takes to score one document
+        self._seconds_per_document: float | None = None
+
+        # 📊 Counters
+        self.reranked = 0
+        self.skipped = 0
+        self.abandoned = 0
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            'reranked': self.reranked,
+            'skipped': self.skipped,
+            'abandoned': self.abandoned,
+            'seconds_per_document': self._seconds_per_document,
+        }
+
+    def rerank(self, query: str, documents: list[dict[str, Any]], top_k: int | None = None) -> list[dict[str, Any]]:
+        top_k = top_k or self.config.top_k
+        if not documents:
+            return documents
+
+        candidates, rest = documents[:self.config.prefilter], documents[self.config.prefilter:]
+        budget = self.config.latency_budget
+        if budget is not None and self._seconds_per_document is not None \
+                and self._seconds_per_document * len(candidates) > budget:
+            # Decay the estimate, so a transient slowdown doesn't disable reranking for good
+            self._seconds_per_document *= 0.9
+            self.skipped += 1
+            return _vector_order(documents, top_k)
+
+        try:
+            scores = self._score(query, [_text(doc) for doc in candidates], budget)
+        except Exception as e:
+            logger.warning(f"Reranking failed, keeping vector order: {e}")
+            return _vector_order(documents, top_k)
+        if not scores:
+            self.abandoned += 1
+            return _vector_order(documents, top_k)
+        if len(scores) < len(candidates):
+            self.abandoned += 1
+        else:
+            self.reranked += 1
+
+        scored, unscored = candidates[:len(scores)], candidates[len(scores):]
+        ranked = sorted(zip(scored, scores), key=lambda pair: pair[1], reverse=True)
+        results = [{**doc, 'rerank_score': score} for doc, score in ranked]
+        results += [{**doc, 'rerank_score': 0.0} for doc in unscored + rest]
+        return results[:top_k] if top_k else results
+
+    def _score(self, query: str, texts: list[str], budget: float | None) -> list[float]:
+        """Sigmoid relevance of the texts, in order; only the first ones when `budget` runs out."""
+        import torch
+
+        start = time.perf_counter()
+        scores = []
+        for offset in range(0, len(texts), self.batch_size):
+            if budget is not None and time.perf_counter() - start > budget:
+                break
+            batch = texts[offset:offset + self.batch_size]
+            inputs = self.tokenizer([[query, text] for text in batch], padding=True, truncation=True,
+                                    max_length=self.config.max_length, return_tensors="pt").to(self.device)
+            with torch.inference_mode():
+                logits = self.model(**inputs).logits.view(-1).float()
+            batch_scores = torch.sigmoid(logits) if self.config.normalize else logits
+            scores.extend(batch_scores.cpu().tolist())
+
+        elapsed = time.perf_counter() - start
+        if scores:
+            per_document = elapsed / len(scores)
+            previous = self._seconds_per_document
+            self._seconds_per_document = per_document if previous is None else 0.8 * previous + 0.2 * per_document
+        return scores
+
+
+def _text(doc: dict[str, Any]) -> str:
+    for field in ('memory', 'text', 'content'):
+        if field in doc:
+            return doc[field]
+    return str(doc)
+
+
+def _vector_order(documents: list[dict[str, Any]], top_k: int | None) -> list[dict[str, Any]]:
+    results = [{**doc, 'rerank_score': 0.0} for doc in documents]
+    return results[:top_k] if top_k else results
+
+
+def register():
+    """Make `RerankerConfig(provider="hephaestus", ...)` build a `BudgetedReranker`."""
+    from mem0.utils.factory import RerankerFactory
+
+    RerankerFactory.provider_to_class[PROVIDER] = (f"{__name__}.BudgetedReranker", BudgetedRerankerConfig)
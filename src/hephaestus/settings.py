@@ -1,10 +1,18 @@
 from typing import Any, Dict, List, Tuple, Type
+import contextvars
+import hashlib
+import importlib.metadata
 import importlib.resources
 import json
+import marshal
+import sys
+import tempfile
+import pydantic
 from pydantic import BaseModel, model_validator
 from pydantic.fields import FieldInfo
 from pydantic_settings import (
     BaseSettings,
+    InitSettingsSource,
     PydanticBaseSettingsSource,
     SettingsConfigDict,
     YamlConfigSettingsSource,
@@ -19,6 +27,10 @@ DEFAULT_YAML_PATH = settings_dir / 'settings.yaml'
 # User YAML file path (in current working directory)
 USER_YAML_PATH = Path(os.getcwd()) / 'settings.yaml'
 
+# Opt-in compiled settings snapshot: set to 1/true for ~/.cache/hephaestus, or to a directory
+SETTINGS_CACHE_ENV = "HEPHAESTUS_SETTINGS_CACHE"
+DEFAULT_SETTINGS_CACHE_DIR = Path.home() / ".cache" / "hephaestus"
+
 # Env vars to ignore (system/shell vars)
 IGNORED_ENV_VARS = {
     "PATH", "HOME", "USER", "SHELL", "PWD", "OLDPWD", "TERM", "LANG", "LC_ALL",
@@ -55,16 +67,21 @@ class EnvSettingsSource(PydanticBaseSettingsSource):
         """📦 Return all env vars as settings dict."""
         result: Dict[str, Any] = {}
 
-        for key, value in os.environ.items():
-            # Skip system/shell env vars
-            if key in IGNORED_ENV_VARS or key.startswith("_"):
-                continue
-
+        for key, value in settings_environ().items():
             result[key] = self._parse_value(value)
 
         return result
 
 
+def settings_environ() -> Dict[str, str]:
+    """🌍 The env vars that feed into settings (everything but system/shell vars)."""
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key not in IGNORED_ENV_VARS and not key.startswith("_")
+    }
+
+
 class DynamicModel(BaseModel):
     """🔄 Recursively converts nested dicts to Pydantic objects with dot notation access."""
 
@@ -148,18 +165,273 @@ class Settings(BaseSettings):
         4. default_yaml - Package default settings.yaml
         """
         sources = []
+        preloaded = _preloaded_yaml.get()
 
         # User YAML has highest priority
-        if USER_YAML_PATH.exists():
+        if preloaded is not None:
+            if preloaded["user"] is not None:
+                sources.append(InitSettingsSource(settings_cls, preloaded["user"]))
+        elif USER_YAML_PATH.exists():
             sources.append(YamlConfigSettingsSource(settings_cls, yaml_file=USER_YAML_PATH))
 
         sources.append(init_settings)
         sources.append(EnvSettingsSource(settings_cls))  # Custom env source that reads ALL env vars
 
         # Default YAML has lowest priority
-        sources.append(YamlConfigSettingsSource(settings_cls, yaml_file=DEFAULT_YAML_PATH))
+        if preloaded is not None:
+            sources.append(InitSettingsSource(settings_cls, preloaded["default"]))
+        else:
+            sources.append(YamlConfigSettingsSource(settings_cls, yaml_file=DEFAULT_YAML_PATH))
 
         return tuple(sources)
 
 
-settings = Settings()
\ No newline at end of file
+# Parsed YAML files for the `Settings()` being built, when `load_settings` has them cached
+_preloaded_yaml: contextvars.ContextVar[Dict[str, Any] | None] = contextvars.ContextVar(
+    "hephaestus_preloaded_yaml", default=None)
+
+
+class FrozenNode:
+    """🧊 Immutable, slots-backed settings node with the same read API as `DynamicModel`.
+
+    Values live in a plain dict, so attribute and item access are a single
+    dict lookup. `keys()`/`values()`/`items()` are built once, and
+    `model_dump()` copies a dump made at freeze time instead of re-serializing
+    (through `marshal`, i.e. in C, when the values allow it).
+    """
+
+    __slots__ = ("_values", "_dump", "_dump_blob", "_keys")
+
+    def __init__(self, data: Dict[str, Any]):
+        values = {key: _freeze_value(value) for key, value in data.items()}
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_dump", data)
+        object.__setattr__(self, "_dump_blob", None)
+        object.__setattr__(self, "_keys", tuple(values))
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key: str, value: Any):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, key: str):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._dump!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._keys
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(self._values.values())
+
+    def items(self) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(self._values.items())
+
+    def model_dump(self) -> Dict[str, Any]:
+        """A fresh (mutable) copy of this subtree as plain dicts and lists."""
+        blob = self._dump_blob
+        if blob is None:
+            try:
+                blob = marshal.dumps(self._dump)
+            except ValueError:  # Not plain data (e.g. objects passed to Settings())
+                blob = b""
+            object.__setattr__(self, "_dump_blob", blob)
+        return marshal.loads(blob) if blob else _copy_tree(self._dump)
+
+
+class FrozenSettings(FrozenNode):
+    """🧊 Compiled, immutable view of `Settings`, with O(1) dotted-path lookups.
+
+    >>> frozen = get_frozen_settings()
+    >>> frozen.lookup("celery.broker_pool_limit")
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        index: Dict[str, Any] = {}
+        _index_paths(self, "", index)
+        object.__setattr__(self, "_index", index)
+
+    def lookup(self, path: str, default: Any = None) -> Any:
+        """Value at a dotted path such as `"celery.broker_pool_limit"`."""
+        return self._index.get(path, default)
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenNode(value)
+    if isinstance(value, list):
+        return tuple(_freeze_value(item) for item in value)
+    return value
+
+
+def _index_paths(node: FrozenNode, prefix: str, index: Dict[str, Any]):
+    for key, value in node._values.items():
+        path = f"{prefix}{key}"
+        index[path] = value
+        if isinstance(value, FrozenNode):
+            _index_paths(value, f"{path}.", index)
+
+
+def _copy_tree(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy_tree(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(item) for item in value]
+    return value
+
+
+def freeze_settings(source: Settings) -> FrozenSettings:
+    return FrozenSettings(source.model_dump())
+
+
+_frozen_settings: FrozenSettings | None = None
+
+
+def get_frozen_settings() -> FrozenSettings:
+    """🧊 The frozen view of `settings`, compiled on first use."""
+    global _frozen_settings
+    if _frozen_settings is None:
+        _frozen_settings = freeze_settings(settings)
+    return _frozen_settings
+
+
+def reset_frozen_settings():
+    """Drop the frozen view so the next `get_frozen_settings()` recompiles it (after a reload)."""
+    global _frozen_settings
+    _frozen_settings = None
+
+
+def _settings_cache_dir() -> Path | None:
+    value = os.environ.get(SETTINGS_CACHE_ENV, "").strip()
+    if value.lower() in ("", "0", "false", "no"):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return DEFAULT_SETTINGS_CACHE_DIR
+    return Path(value)
+
+
+def settings_cache_key() -> str:
+    """🔑 Hash of everything the cached YAML data depends on: both YAML files, this code, the runtime."""
+    digest = hashlib.sha256()
+    try:
+        version = importlib.metadata.version("hephaestus")
+    except importlib.metadata.PackageNotFoundError:
+        version = "<unknown>"
+    digest.update(f"{sys.version}|{pydantic.VERSION}|{version}".encode())
+    digest.update(Path(__file__).read_bytes())
+
+    for path in (Path(str(DEFAULT_YAML_PATH)), USER_YAML_PATH):
+        digest.update(str(path).encode())
+        try:
+            digest.update(str(path.stat().st_mtime_ns).encode())
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+
+    return digest.hexdigest()[:32]
+
+
+def settings_cache_identity() -> str:
+    """🪪 Hash of where the settings come from: the user YAML path (cwd), the install location and venv.
+
+    Cache entries of one identity replace each other; other checkouts, working
+    directories and venvs sharing the cache directory keep theirs.
+    """
+    source = f"{USER_YAML_PATH}|{DEFAULT_YAML_PATH}|{sys.prefix}"
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def load_settings() -> Settings:
+    """
+    ⚡ Build `Settings()`, reading the YAML files from a cache when
+    `HEPHAESTUS_SETTINGS_CACHE` is set.
+
+    Only the parsed YAML files are cached, as JSON (readable by the current
+    user only), under `settings_cache_key()`. The env is read on every call,
+    so secrets never reach the disk. Any change to the YAML files (mtime or
+    content), this module or the package version gives a new key, so a stale
+    cache is never read - it is rebuilt, and the entry it replaces (same
+    `settings_cache_identity()`) is removed.
+    """
+    cache_dir = _settings_cache_dir()
+    if cache_dir is None:
+        return Settings()
+
+    cache_path = cache_dir / f"settings-{settings_cache_identity()}-{settings_cache_key()}.json"
+    yaml_data = None
+    try:
+        with open(cache_path, "rb") as f:
+            yaml_data = json.load(f)
+        if not isinstance(yaml_data, dict) or set(yaml_data) != {"user", "default"}:
+            raise ValueError("unexpected layout")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        yaml_data = None
+        print(f"⚠️ Ignoring unreadable settings cache {cache_path}: {e!r}", file=sys.stderr)
+
+    if yaml_data is None:
+        yaml_data = _read_yaml_files()
+        try:
+            _write_settings_cache(cache_path, yaml_data)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not write settings cache {cache_path}: {e!r}", file=sys.stderr)
+
+    token = _preloaded_yaml.set(yaml_data)
+    try:
+        return Settings()
+    finally:
+        _preloaded_yaml.reset(token)
+
+
+def _read_yaml_files() -> Dict[str, Any]:
+    user = None
+    if USER_YAML_PATH.exists():
+        user = YamlConfigSettingsSource(Settings, yaml_file=USER_YAML_PATH).yaml_data
+    default = YamlConfigSettingsSource(Settings, yaml_file=DEFAULT_YAML_PATH).yaml_data
+    return {"user": user, "default": default}
+
+
+def _write_settings_cache(cache_path: Path, yaml_data: Dict[str, Any]):
+    blob = json.dumps(yaml_data).encode()  # Raises on YAML values JSON can't represent
+    cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_path.parent, prefix=".settings-", delete=False) as f:
+        try:
+            os.fchmod(f.fileno(), 0o600)
+            f.write(blob)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, cache_path)  # Atomic: concurrent starters never read half a file
+
+    identity = cache_path.name.rsplit("-", 1)[0]
+    for stale in cache_path.parent.glob(f"{identity}-*.json"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
+
+settings = load_settings()
\ No newline at end of file
@@ -0,0 +1,203 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from hephaestus.settings import (
+    DEFAULT_YAML_PATH,
+    USER_YAML_PATH,
+    load_settings,
+    reset_frozen_settings,
+    settings,
+)
+
+logger = logging.getLogger('hephaestus.settings')
+
+
+class _Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+
+# Marks the `old` side of an added key or the `new` side of a removed one
+MISSING: Any = _Missing()
+
+
+class SettingsChange(NamedTuple):
+    """One changed leaf of the settings tree, e.g. `logging.handlers.elastic.batch_size`."""
+
+    path: str
+    old: Any
+    new: Any
+
+
+SettingsCallback = Callable[[List[SettingsChange]], None]
+
+
+class SettingsWatcher:
+    """👀 Polls the default and user settings.yaml and hot-reloads `settings` in place.
+
+    When either file changes, `Settings` is rebuilt, but only the top-level
+    subtrees that actually differ are swapped into the live `settings` object,
+    so everything else keeps its identity. Subscribers then receive the list
+    of changed leaves (`SettingsChange`).
+
+    The polling thread does not survive `fork()`. With `restart_in_child`, a
+    forked child starts its own; otherwise children don't watch (e.g. prefork
+    workers, whose parent usually restarts them on config changes anyway).
+    """
+
+    def __init__(self, interval: float = 2.0, restart_in_child: bool = False):
+        self.interval = interval
+        self.restart_in_child = restart_in_child
+        self._subscribers: List[SettingsCallback] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stamps = self._file_stamps()
+
+    def subscribe(self, callback: SettingsCallback) -> Callable[[], None]:
+        """Call `callback(changes)` after every reload. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: SettingsCallback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # A fresh event per thread: a previous thread still winding down keeps its own, set one
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True,
+                                        name="settings-watcher")
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling; returns once the polling thread has exited."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def check(self) -> List[SettingsChange]:
+        """Reload if a settings file changed since the last check."""
+        stamps = self._file_stamps()
+        if stamps == self._stamps:
+            return []
+        self._stamps = stamps
+        return self.reload()
+
+    def reload(self) -> List[SettingsChange]:
+        """Rebuild settings, apply the changed subtrees in place and notify subscribers."""
+        try:
+            fresh = load_settings()
+        except Exception as e:
+            logger.warning(f"Settings reload failed, keeping the current settings: {e}")
+            return []
+
+        changes = _apply(settings, fresh)
+        if not changes:
+            return []
+        reset_frozen_settings()
+
+        logger.info(f"Settings reloaded: {', '.join(change.path for change in changes)}")
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception:
+                logger.exception(f"Settings subscriber {callback!r} failed")
+        return changes
+
+    def _run(self, stop: threading.Event):
+        while not stop.wait(self.interval):
+            self.check()
+
+    def _after_fork_in_child(self):
+        """Threads do not survive fork(): keep watching in the child only when `restart_in_child`."""
+        self._lock = threading.Lock()
+        was_watching = self._thread is not None and not self._stop.is_set()
+        self._thread = None
+        self._stop = threading.Event()
+        if was_watching and self.restart_in_child:
+            self.start()
+
+    @staticmethod
+    def _file_stamps() -> Tuple[Tuple[int, int] | None, ...]:
+        stamps = []
+        for path in (Path(str(DEFAULT_YAML_PATH)), USER_YAML_PATH):
+            try:
+                stat = path.stat()
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+
+def _apply(current, fresh) -> List[SettingsChange]:
+    """Swap the top-level subtrees of `fresh` that differ into `current`, return the leaf diff."""
+    old_dump = current.model_dump()
+    new_dump = fresh.model_dump()
+
+    changes: List[SettingsChange] = []
+    for key in old_dump.keys() | new_dump.keys():
+        old = old_dump.get(key, MISSING)
+        new = new_dump.get(key, MISSING)
+        if old == new:
+            continue
+        _diff(key, old, new, changes)
+
+        if new is MISSING:
+            current.__dict__.pop(key, None)
+            if current.__pydantic_extra__ is not None:
+                current.__pydantic_extra__.pop(key, None)
+            continue
+        object.__setattr__(current, key, getattr(fresh, key))
+        if fresh.__pydantic_extra__ and key in fresh.__pydantic_extra__:
+            current.__pydantic_extra__[key] = fresh.__pydantic_extra__[key]
+
+    return sorted(changes, key=lambda change: change.path)
+
+
+def _diff(path: str, old: Any, new: Any, changes: List[SettingsChange]):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old.keys() | new.keys():
+            old_value = old.get(key, MISSING)
+            new_value = new.get(key, MISSING)
+            if old_value != new_value:
+                _diff(f"{path}.{key}", old_value, new_value, changes)
+    else:
+        changes.append(SettingsChange(path, old, new))
+
+
+settings_watcher = SettingsWatcher()
+os.register_at_fork(after_in_child=settings_watcher._after_fork_in_child)
+
+
+def subscribe(callback: SettingsCallback) -> Callable[[], None]:
+    """🔔 Get notified with the list of `SettingsChange` after every hot reload."""
+    return settings_watcher.subscribe(callback)
+
+
+def start_settings_watcher(interval: float | None = None, restart_in_child: bool | None = None):
+    """Start polling the settings files (idempotent)."""
+    if interval is not None:
+        settings_watcher.interval = interval
+    if restart_in_child is not None:
+        settings_watcher.restart_in_child = restart_in_child
+    settings_watcher.start()
+
+
+def changes_under(changes: List[SettingsChange], prefix: str) -> Dict[str, SettingsChange]:
+    """The changes below `prefix` (e.g. `"logging."`), keyed by their path relative to it."""
+    return {
+        change.path[len(prefix):]: change
+        for change in changes
+        if change.path.startswith(prefix)
+    }
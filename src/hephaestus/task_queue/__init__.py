@@ -1,4 +1,16 @@
-from .init_celery import app as task_queue, shared_task
+# Celery is imported (and the app configured) on first access
+__all__ = ["task_queue", "app", "celery", "shared_task", "batched_task"]
 
 
-__all__ = ["task_queue", "shared_task"]
\ No newline at end of file
+def __getattr__(name):
+    if name in ("task_queue", "app", "celery"):
+        # `app`/`celery`: what `celery -A hephaestus.task_queue` looks up
+        from .init_celery import app
+        return app
+    if name == "shared_task":
+        from .init_celery import shared_task
+        return shared_task
+    if name == "batched_task":
+        from .batching import batched_task
+        return batched_task
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import weakref
+from typing import Any, Coroutine
+
+from celery.exceptions import SoftTimeLimitExceeded, TimeLimitExceeded
+
+from hephaestus.settings import get_frozen_settings
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskRunner:
+    """🚀 Runs many coroutine tasks at once on the worker loop, within limits.
+
+    Meant for I/O-bound tasks and a thread pool worker
+    (`celery worker -P threads -c 200`): each pool thread only waits on the
+    shared event loop, so one process has as many tasks in flight as it has
+    threads, capped by `max_in_flight`.
+
+    The threads pool doesn't enforce time limits, so they are enforced here,
+    from the moment a task gets a slot:
+    - soft limit: the coroutine is cancelled (it may catch `CancelledError` to
+      clean up) and the task fails with `SoftTimeLimitExceeded`
+    - hard limit: the coroutine is cancelled (again) and the task fails with
+      `TimeLimitExceeded` once it stops, or after `cancel_timeout` seconds if
+      it doesn't (it is then left running, and logged)
+    """
+
+    def __init__(self, max_in_flight: int | None = None, cancel_timeout: float | None = None):
+        defaults = get_frozen_settings().async_tasks
+        self.max_in_flight = defaults.max_in_flight if max_in_flight is None else max_in_flight
+        self.cancel_timeout = defaults.cancel_timeout if cancel_timeout is None else cancel_timeout
+        # asyncio primitives are bound to one event loop
+        self._limiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        # 📊 Counters
+        self.in_flight = 0
+        self.soft_timeouts = 0
+        self.hard_timeouts = 0
+
+    def stats(self) -> dict[str, int]:
+        return {'in_flight': self.in_flight, 'soft_timeouts': self.soft_timeouts,
+                'hard_timeouts': self.hard_timeouts}
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = self._limiters[loop] = asyncio.Semaphore(self.max_in_flight)
+        return limiter
+
+    async def run(self, coro: Coroutine, soft_time_limit: float | None = None,
+                  time_limit: float | None = None, name: str = 'task') -> Any:
+        async with self._limiter():
+            self.in_flight += 1
+            task = asyncio.ensure_future(coro)
+            try:
+                return await self._supervise(task, soft_time_limit, time_limit, name)
+            except asyncio.CancelledError:
+                # We are being cancelled (worker shutdown): take the task down with us
+                task.cancel()
+                raise
+            finally:
+                self.in_flight -= 1
+
+    async def _supervise(self, task: asyncio.Future, soft: float | None, hard: float | None, name: str) -> Any:
+        first_deadline = soft if soft is not None else hard
+        done, _ = await asyncio.wait({task}, timeout=first_deadline)
+        if done:
+            return task.result()
+
+        if soft is None:
+            await self._hard_timeout(task, hard, name)
+
+        logger.warning(f"Task {name} exceeded its soft time limit ({soft}s), cancelling it")
+        self.soft_timeouts += 1
+        task.cancel(f'soft time limit ({soft}s) exceeded')
+        grace = None if hard is None else max(hard - soft, 0)
+        done, _ = await asyncio.wait({task}, timeout=grace)
+        if not done:
+            await self._hard_timeout(task, hard, name)
+        if task.cancelled():
+            raise SoftTimeLimitExceeded()
+        # The coroutine handled the cancellation and returned (or raised) on its own
+        return task.result()
+
+    async def _hard_timeout(self, task: asyncio.Future, hard: float, name: str):
+        """Cancel `task`, wait (up to `cancel_timeout`) for it to stop and raise `TimeLimitExceeded`."""
+        logger.warning(f"Task {name} exceeded its hard time limit ({hard}s), cancelling it")
+        self.hard_timeouts += 1
+        task.cancel(f'hard time limit ({hard}s) exceeded')
+        done, _ = await asyncio.wait({task}, timeout=self.cancel_timeout)
+        if not done:
+            logger.error(f"Task {name} still running {self.cancel_timeout}s after its hard time limit cancelled it")
+        elif not task.cancelled():
+            # Retrieve it, so asyncio doesn't log it as never retrieved
+            task.exception()
+        raise TimeLimitExceeded(hard)
+
+
+async_task_runner = AsyncTaskRunner()
+
+
+def time_limits(task=None) -> tuple[float | None, float | None]:
+    """(soft, hard) time limits of `task`'s current request, as Celery resolves them.
+
+    Per-call `apply_async(soft_time_limit=..., time_limit=...)` first, then the
+    task's options, then `task_soft_time_limit` / `task_time_limit`.
+    """
+    if not task:
+        frozen = get_frozen_settings()
+        return frozen.lookup('celery.task_soft_time_limit'), frozen.lookup('celery.task_time_limit')
+    hard, soft = getattr(task.request, 'timelimit', None) or (None, None)
+    if hard is None:
+        hard = task.time_limit if task.time_limit is not None else task.app.conf.task_time_limit
+    if soft is None:
+        soft = task.soft_time_limit if task.soft_time_limit is not None else task.app.conf.task_soft_time_limit
+    return soft, hard
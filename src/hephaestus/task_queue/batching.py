@@ -0,0 +1,307 @@
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable
+
+from hephaestus.settings import get_frozen_settings
+
+from .init_celery import shared_task
+from .worker_loop import run_async
+
+logger = logging.getLogger(__name__)
+
+
+class BatchItemError(Exception):
+    """An item of a batch failed in the worker; `type` is the name of the original exception."""
+
+    def __init__(self, type: str, message: str):
+        super().__init__(f'{type}: {message}')
+        self.type = type
+        self.message = message
+
+
+def _encode_outcomes(items: list, outcomes: list) -> list[dict]:
+    if len(outcomes) != len(items):
+        raise ValueError(f"Batch handler returned {len(outcomes)} results for {len(items)} items")
+    return [{'error': type(outcome).__name__, 'message': str(outcome)} if isinstance(outcome, Exception)
+            else {'result': outcome}
+            for outcome in outcomes]
+
+
+class BatchedTask:
+    """📦 A Celery task that handles items in batches, with one future per item.
+
+    Producers `submit(item)` (or `await asubmit(item)`) single items. They are
+    buffered in the producer process and published as one task message per
+    batch of up to `max_size` items, at most `max_wait` seconds after the
+    first item of the batch arrived: that is what saves broker round trips.
+
+    The worker gathers again, across producers: messages it runs at the same
+    time (`async_mode`, or a threads pool) are merged into one handler call of
+    up to `max_size` items, waiting at most `worker_max_wait` seconds after
+    the first one. Single-item callers spread over a fleet thus still share
+    handler calls. With one task at a time per process (prefork, solo) there
+    is nothing to merge: set `worker_max_wait` to 0 there.
+
+    The handler takes the list of items and returns one result per item, in
+    order; an `Exception` in place of a result fails just that item (as a
+    `BatchItemError` on the producer). If the handler raises, every item of
+    the batch fails.
+
+    Results travel back through the result backend when `results=True`,
+    collected by a single thread (result backends such as `rpc://` aren't
+    thread-safe); otherwise the futures resolve to None once the batch is
+    published.
+    """
+
+    def __init__(self, handler: Callable, max_size: int, max_wait: float, results: bool,
+                 result_timeout: float, worker_max_wait: float = 0.0, **task_options):
+        self.handler = handler
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.results = results
+        self.result_timeout = result_timeout
+        self.worker_max_wait = worker_max_wait
+        # asyncio primitives are bound to one event loop
+        self._gatherers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        if asyncio.iscoroutinefunction(handler):
+            async def run_batch(items: list) -> list[dict]:
+                return await self._gather(items)
+        else:
+            def run_batch(items: list) -> list[dict]:
+                if self.worker_max_wait <= 0:
+                    self.handler_calls += 1
+                    return _encode_outcomes(items, handler(items))
+                # Gathered on the worker loop, the handler itself runs on a thread
+                return run_async(self._gather(items))
+        run_batch.__name__ = run_batch.__qualname__ = handler.__name__
+        run_batch.__module__ = handler.__module__
+
+        task_options.setdefault('name', f'{handler.__module__}.{handler.__name__}')
+        task_options.setdefault('ignore_result', not results)
+        self.task = shared_task(**task_options)(run_batch)
+
+        self._pending: list[tuple[Any, concurrent.futures.Future]] = []
+        self._first_at: float | None = None
+        self._condition = threading.Condition()
+        self._flusher: threading.Thread | None = None
+        self._collector: concurrent.futures.ThreadPoolExecutor | None = None
+        self._pid: int | None = None
+
+        # 📊 Counters
+        self.items = 0
+        self.batches = 0
+        self.handler_calls = 0
+
+    def __call__(self, items: list) -> list[dict]:
+        """Run the handler on `items` in-process, like calling a task directly."""
+        return self.task(items)
+
+    def stats(self) -> dict[str, int | float]:
+        return {'items': self.items, 'batches': self.batches,
+                'average_batch_size': self.items / self.batches if self.batches else 0.0,
+                'handler_calls': self.handler_calls}
+
+    def submit(self, item: Any) -> concurrent.futures.Future:
+        """Queue `item` for the next batch; the future resolves to its result."""
+        future = concurrent.futures.Future()
+        with self._condition:
+            self._ensure_started()
+            if not self._pending:
+                self._first_at = time.monotonic()
+            self._pending.append((item, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_size:
+                # Start the max_wait timer, or flush a full batch
+                self._condition.notify()
+        return future
+
+    async def asubmit(self, item: Any) -> Any:
+        """`submit` and await the item's result."""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def flush(self):
+        """Publish what is buffered now, without waiting for `max_wait`."""
+        with self._condition:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._publish(batch)
+
+    def _ensure_started(self):
+        if self._pid == os.getpid() and self._flusher is not None:
+            return
+        self._pid = os.getpid()
+        self._collector = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f'batch-results-{self.task.name}')
+        self._flusher = threading.Thread(target=self._flush_loop, name=f'batch-{self.task.name}', daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            with self._condition:
+                while True:
+                    if len(self._pending) >= self.max_size:
+                        break
+                    if self._pending:
+                        remaining = self._first_at + self.max_wait - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                batch, self._pending = self._pending[:self.max_size], self._pending[self.max_size:]
+                if self._pending:
+                    self._first_at = time.monotonic()
+            self._publish(batch)
+
+    def _publish(self, batch: list[tuple[Any, concurrent.futures.Future]]):
+        items = [item for item, _ in batch]
+        futures = [future for _, future in batch]
+        try:
+            async_result = self.task.apply_async((items,))
+        except Exception as e:
+            logger.exception(f"Failed to publish a batch of {len(items)} items to {self.task.name}")
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        self.items += len(items)
+        self.batches += 1
+        if not self.results:
+            for future in futures:
+                future.set_result(None)
+            return
+        deadline = time.monotonic() + self.result_timeout
+        try:
+            self._collector.submit(self._collect, async_result, futures, deadline)
+        except RuntimeError:
+            # Interpreter shutdown (flush at exit): the batch is published, nobody waits for results
+            pass
+
+    async def _gather(self, items: list) -> list[dict]:
+        """Worker side: run `items` in a handler call shared with the messages arriving meanwhile."""
+        if self.worker_max_wait <= 0:
+            return await self._call_handler(items)
+        loop = asyncio.get_running_loop()
+        gatherer = self._gatherers.get(loop)
+        if gatherer is None:
+            gatherer = self._gatherers[loop] = _Gatherer(self)
+        return await gatherer.add(items)
+
+    async def _call_handler(self, items: list) -> list[dict]:
+        self.handler_calls += 1
+        if asyncio.iscoroutinefunction(self.handler):
+            outcomes = await self.handler(items)
+        else:
+            outcomes = await asyncio.to_thread(self.handler, items)
+        return _encode_outcomes(items, outcomes)
+
+    def _collect(self, async_result, futures: list[concurrent.futures.Future], deadline: float):
+        # Batches are collected one after the other: time spent on earlier ones counts against this one
+        try:
+            outcomes = async_result.get(timeout=max(deadline - time.monotonic(), 0.001))
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, outcome in zip(futures, outcomes):
+            if 'error' in outcome:
+                future.set_exception(BatchItemError(outcome['error'], outcome['message']))
+            else:
+                future.set_result(outcome['result'])
+
+
+class _Gatherer:
+    """Merges the messages of a `BatchedTask` that one event loop runs at the same time."""
+
+    def __init__(self, batched: BatchedTask):
+        self.batched = batched
+        self._groups: list[tuple[list, asyncio.Future]] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def add(self, items: list) -> list[dict]:
+        if self._groups and self._size + len(items) > self.batched.max_size:
+            self._flush()
+        future = asyncio.get_running_loop().create_future()
+        self._groups.append((items, future))
+        self._size += len(items)
+        if self._size >= self.batched.max_size:
+            self._flush()
+        elif len(self._groups) == 1:
+            self._timer = asyncio.get_running_loop().call_later(self.batched.worker_max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        groups, self._groups, self._size = self._groups, [], 0
+        if groups:
+            asyncio.ensure_future(self._run(groups))
+
+    async def _run(self, groups: list[tuple[list, asyncio.Future]]):
+        items = [item for group, _ in groups for item in group]
+        try:
+            outcomes = await self.batched._call_handler(items)
+        except Exception as e:
+            for _, future in groups:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for group, future in groups:
+            if not future.done():  # Cancelled, e.g. by its time limit
+                future.set_result(outcomes[offset:offset + len(group)])
+            offset += len(group)
+
+
+_batched_tasks: list[BatchedTask] = []
+
+
+@atexit.register
+def _flush_all():
+    for batched in _batched_tasks:
+        if batched._pid == os.getpid():
+            batched.flush()
+
+
+def _reset_after_fork():
+    # The parent's threads (and whoever waits on its items) don't exist here, and a lock
+    # one of them held at fork would stay held forever
+    for batched in _batched_tasks:
+        batched._condition = threading.Condition()
+        batched._pending = []
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def batched_task(*, max_size: int | None = None, max_wait: float | None = None, results: bool = True,
+                 result_timeout: float | None = None, worker_max_wait: float | None = None, **task_options):
+    """Decorator: turn a batch handler (`items -> results`) into a `BatchedTask`.
+
+    `task_options` go to `shared_task` (e.g. `name`, `async_mode`, `queue`).
+    Defaults come from `settings.batching`.
+    """
+    defaults = get_frozen_settings().batching
+
+    def decorator(handler: Callable) -> BatchedTask:
+        batched = BatchedTask(
+            handler,
+            max_size=defaults.max_size if max_size is None else max_size,
+            max_wait=defaults.max_wait if max_wait is None else max_wait,
+            results=results,
+            result_timeout=defaults.result_timeout if result_timeout is None else result_timeout,
+            worker_max_wait=defaults.worker_max_wait if worker_max_wait is None else worker_max_wait,
+            **task_options,
+        )
+        _batched_tasks.append(batched)
+        return batched
+
+    return decorator
@@ -1,27 +1,31 @@
 
 import asyncio
-import nest_asyncio
+import concurrent.futures
 import signal
 import sys
 import time
 
-from celery import Celery, shared_task as _shared_task
+from celery import Celery, current_task, shared_task as _shared_task
 from celery import signals
+from celery.concurrency import get_implementation
+from celery.concurrency.prefork import TaskPool as PreforkPool
+from celery.exceptions import Reject
 from celery.signals import setup_logging as celery_setup_logging
 
-from hephaestus.settings import settings
+from hephaestus.settings import get_frozen_settings
 from hephaestus.logging import get_logger
+from hephaestus.checkpointer.init_checkpointer import close_checkpointers
 
+from .async_tasks import async_task_runner, time_limits
 from .cleanup_old_workers import cleanup_old_workers
+from .serialization import register_serializer
+from .worker_loop import run_async, worker_loop
 
 logger = get_logger(__name__)
 
-# Apply nest_asyncio to allow nested event loops
-nest_asyncio.apply()
-
 app = Celery("task_queue")
 
-app.conf.update(**settings.celery.model_dump())
+app.conf.update(**get_frozen_settings().celery.model_dump())
 
 app.autodiscover_tasks()
 
@@ -52,21 +56,120 @@ def handle_shutdown_signal(signum, frame):
 
         sys.exit(0)
 
-# Register signal handlers for graceful shutdown
-signal.signal(signal.SIGTERM, handle_shutdown_signal)
-signal.signal(signal.SIGINT, handle_shutdown_signal)
-signal.signal(signal.SIGQUIT, handle_shutdown_signal)
+@signals.worker_init.connect
+def install_shutdown_signal_handlers(**kwargs):
+    """Register signal handlers for graceful shutdown.
+
+    Only in workers: importing the task queue from a producer (e.g. Streamlit)
+    must not take over its SIGINT/SIGTERM. Pool processes inherit them on fork.
+    """
+    signal.signal(signal.SIGTERM, handle_shutdown_signal)
+    signal.signal(signal.SIGINT, handle_shutdown_signal)
+    signal.signal(signal.SIGQUIT, handle_shutdown_signal)
+
+
+@signals.worker_init.connect
+@signals.before_task_publish.connect
+def register_task_serializer(**kwargs):
+    """Register the `hephaestus` serializer at worker start (pool processes inherit it) and before a publish.
+
+    Not at import: building it loads LangGraph's serializers, which producers
+    that never publish (or only use json) don't need.
+    """
+    register_serializer()
+
 
+@signals.worker_init.connect
+def start_worker_loop(sender=None, **kwargs):
+    """Start the event loop of the process that runs the tasks, before the first task needs it.
 
-def shared_task(*args, **kwargs):
+    - prefork pool: tasks run in the child processes, each starts its own loop
+      at `worker_process_init` (see `start_child_worker_loop`), never the parent
+    - solo, threads (and other in-process pools): `worker_process_init` never
+      fires, so the worker process starts its loop here; with threads, all the
+      pool threads share it
+
+    Outside a worker (tasks called directly or eagerly, custom pools whose
+    type can't be resolved), `run_async` starts the loop on first use.
+    """
+    try:
+        pool_cls = get_implementation(sender.pool_cls)
+    except Exception as e:
+        logger.debug(f"Unknown pool type, the event loop starts on first use: {e}")
+        return
+    if not issubclass(pool_cls, PreforkPool):
+        worker_loop.start()
+        warm_up_memory()
+
+
+@signals.worker_process_init.connect
+def start_child_worker_loop(**kwargs):
+    """Prefork pool: start the child process's event loop (a loop inherited from the parent is discarded)."""
+    worker_loop.start()
+    warm_up_memory()
+
+
+def warm_up_memory():
+    """Warm the memory registry on the worker loop, in the background, when `memory_pool.warmup_on_worker_start`.
+
+    Runs in the process that runs the tasks, so the first task doesn't pay
+    for loading the embedder, vector store and reranker.
+    """
+    if not get_frozen_settings().lookup('memory_pool.warmup_on_worker_start'):
+        return
+    from hephaestus.memory.registry import memory_registry
+
+    future = worker_loop.submit(memory_registry.warmup())
+    future.add_done_callback(_log_warmup_failure)
+
+
+def _log_warmup_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"Memory warmup failed: {future.exception()!r}")
+
+
+@signals.worker_process_shutdown.connect
+@signals.worker_shutdown.connect
+def stop_worker_loop(**kwargs):
+    """Stop the process's event loop; its async generators close the loop-bound checkpointers."""
+    worker_loop.stop()
+
+
+@signals.worker_process_shutdown.connect
+@signals.worker_shutdown.connect
+def close_worker_checkpointers(**kwargs):
+    """Give pooled checkpointer connections back before the worker (process) exits."""
+    close_checkpointers()
+
+
+def shared_task(*args, async_mode: bool | None = None, **kwargs):
 
     """
     Decorator to make a celery's shared_task decorator async-friendly.
-    With nest_asyncio applied, we can safely use asyncio.run() even in nested contexts.
+    Coroutine tasks run on the worker process's long-lived event loop
+    (see `worker_loop`), so loop-bound clients and pools survive across tasks.
     Includes proper signal handling for graceful task termination.
+
+    With `async_mode` (default: `async_tasks.enabled` in settings), coroutine
+    tasks run concurrently with the other tasks of the process, within the
+    in-flight and time limits of `AsyncTaskRunner`; run the worker with
+    `-P threads -c N`. They are acked late and requeued if the worker shuts
+    down while they run.
+
+    Tasks carrying conversations or states can use
+    `serializer="hephaestus"`: compact, compressed bodies, with large ones
+    left in Redis and passed by reference (see `TaskPayloadSerializer`).
     """
 
+    if async_mode is None:
+        async_mode = get_frozen_settings().lookup('async_tasks.enabled')
+
     def decorator(task_func):
+        concurrent_task = async_mode and asyncio.iscoroutinefunction(task_func)
+        task_options = dict(kwargs)
+        if concurrent_task:
+            task_options.setdefault('acks_late', True)
+            task_options.setdefault('reject_on_worker_lost', True)
 
         def inner(*a, **k):
             # Check if shutdown was requested
@@ -75,18 +178,31 @@ def shared_task(*args, **kwargs):
                 return None
 
             try:
+                if concurrent_task:
+                    return _run_concurrently(task_func, a, k)
                 if asyncio.iscoroutinefunction(task_func):
-                    return asyncio.run(task_func(*a, **k))
+                    return run_async(task_func(*a, **k))
                 return task_func(*a, **k)
             except KeyboardInterrupt:
                 logger.warning(f"Task {task_func.__name__} interrupted by user")
                 raise
+            except Reject:
+                raise
             except Exception as e:
                 logger.exception(f"Task {task_func.__name__} failed with error: {e}")
                 raise
 
-        return _shared_task(*args, **kwargs)(inner)
+        return _shared_task(*args, **task_options)(inner)
 
     return decorator
 
 
+def _run_concurrently(task_func, a, k):
+    soft_time_limit, time_limit = time_limits(current_task)
+    coro = async_task_runner.run(task_func(*a, **k), soft_time_limit, time_limit, task_func.__name__)
+    try:
+        return run_async(coro)
+    except concurrent.futures.CancelledError:
+        # The worker loop is shutting down: hand the message back to the broker
+        logger.warning(f"Task {task_func.__name__} interrupted by worker shutdown, requeueing it")
+        raise Reject(f"{task_func.__name__} interrupted by worker shutdown", requeue=True)
@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import os
+from typing import Any
+
+from kombu.serialization import register
+
+from hephaestus.settings import get_frozen_settings
+
+logger = logging.getLogger(__name__)
+
+SERIALIZER_NAME = 'hephaestus'
+CONTENT_TYPE = 'application/x-hephaestus'
+
+_CLAIM_CHECK = 'claim-check'
+
+
+class ClaimCheckError(ValueError):
+    """A claim-checked message body can't be fetched back from Redis."""
+
+
+class TaskPayloadSerializer:
+    """📨 Compact task message bodies: msgpack, compressed when large, claim-checked when huge.
+
+    Bodies are encoded like checkpoints (`CheckpointSerializer`: LangGraph's
+    msgpack, so LangChain messages and pydantic states such as
+    `AgentSwarmState` round-trip, zlib from `compress_threshold` bytes up).
+    Encoded bodies of `claim_check_threshold` bytes or more are stored in
+    Redis under their content hash for `claim_check_ttl` seconds, and the
+    message only carries the key; the worker fetches it back when decoding.
+    Redeliveries and identical payloads share one stored copy. If Redis is
+    unavailable when publishing, the body is sent inline; when decoding, a
+    body that is gone (expired) or can't be fetched within `redis_timeout`
+    seconds raises `ClaimCheckError`.
+
+    Only types in `allowed_types` ((module, class) pairs) and LangGraph's
+    safe types are revived: messages come from outside the process.
+    """
+
+    def __init__(self, compress_threshold: int, compress_level: int, claim_check_threshold: int | None,
+                 claim_check_ttl: int, key_prefix: str, redis_url: str | None,
+                 allowed_types: list[tuple[str, str]], redis_timeout: float = 5):
+        from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+        from hephaestus.checkpointer.serde import CheckpointSerializer
+
+        self.serde = CheckpointSerializer(
+            JsonPlusSerializer(allowed_msgpack_modules=[tuple(allowed) for allowed in allowed_types]),
+            compress_threshold=compress_threshold,
+            compress_level=compress_level,
+        )
+        self.claim_check_threshold = claim_check_threshold
+        self.claim_check_ttl = claim_check_ttl
+        self.key_prefix = key_prefix
+        self.redis_url = redis_url
+        self.redis_timeout = redis_timeout
+        self._redis = None
+        self._redis_pid: int | None = None
+
+    def encode(self, body: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(body)
+        frame = _frame(type_, data)
+        if self.claim_check_threshold is None or len(frame) < self.claim_check_threshold or not self.redis_url:
+            return frame
+
+        key = f'{self.key_prefix}:{hashlib.sha256(frame).hexdigest()}'
+        try:
+            self._client().set(key, frame, ex=self.claim_check_ttl)
+        except Exception as e:
+            logger.warning(f"Claim check store failed, sending {len(frame)} bytes inline: {e}")
+            return frame
+        return _frame(_CLAIM_CHECK, key.encode())
+
+    def decode(self, data: bytes) -> Any:
+        type_, payload = _unframe(data)
+        if type_ == _CLAIM_CHECK:
+            key = payload.decode()
+            if not self.redis_url:
+                raise ClaimCheckError(f"Claim check {key}: no REDIS_URL to fetch the message body from")
+            try:
+                frame = self._client().get(key)
+            except Exception as e:
+                raise ClaimCheckError(f"Failed to fetch claim check {key}: {e}") from e
+            if frame is None:
+                raise ClaimCheckError(f"Claim check {key} is missing or expired (bodies are kept "
+                                      f"{self.claim_check_ttl}s, see task_payloads.claim_check_ttl)")
+            type_, payload = _unframe(frame)
+        return self.serde.loads_typed((type_, payload))
+
+    def _client(self):
+        if self._redis is None or self._redis_pid != os.getpid():
+            from redis import Redis
+            self._redis = Redis.from_url(self.redis_url, socket_timeout=self.redis_timeout,
+                                         socket_connect_timeout=self.redis_timeout)
+            self._redis_pid = os.getpid()
+        return self._redis
+
+
+def _frame(type_: str, data: bytes) -> bytes:
+    return type_.encode() + b'\n' + data
+
+
+def _unframe(data: bytes | str) -> tuple[str, bytes]:
+    if isinstance(data, str):
+        data = data.encode('latin-1')
+    type_, _, payload = bytes(data).partition(b'\n')
+    return type_.decode(), payload
+
+
+_serializer: TaskPayloadSerializer | None = None
+
+
+def register_serializer() -> TaskPayloadSerializer:
+    """Register the `hephaestus` kombu serializer, configured from `settings.task_payloads`.
+
+    Opt in per task with `shared_task(serializer="hephaestus")`, or for all
+    tasks with `task_serializer`; workers need it in `accept_content`.
+    The task queue registers it at worker start and before the first publish;
+    call it directly to decode messages elsewhere.
+    """
+    global _serializer
+    if _serializer is not None:
+        return _serializer
+    frozen = get_frozen_settings()
+    config = frozen.task_payloads
+    redis_url = f'redis://{frozen.REDIS_URL}' if frozen.get('REDIS_URL') else None
+    serializer = TaskPayloadSerializer(
+        compress_threshold=config.compress_threshold,
+        compress_level=config.compress_level,
+        claim_check_threshold=config.get('claim_check_threshold'),
+        claim_check_ttl=config.claim_check_ttl,
+        key_prefix=config.key_prefix,
+        redis_url=redis_url,
+        allowed_types=config.allowed_types,
+        redis_timeout=config.redis_timeout,
+    )
+    register(SERIALIZER_NAME, serializer.encode, serializer.decode,
+             content_type=CONTENT_TYPE, content_encoding='binary')
+    _serializer = serializer
+    return serializer
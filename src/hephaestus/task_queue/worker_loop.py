@@ -0,0 +1,119 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerLoop:
+    """🔁 One long-lived event loop per worker process, on a background thread.
+
+    Coroutine tasks are submitted to it instead of each getting its own
+    `asyncio.run`, so everything bound to a loop (Redis checkpointer pools,
+    AsyncElasticsearch, HTTP clients of the LLMs, mem0) is created once per
+    process and reused across tasks.
+
+    Started when the worker starts, in the process that runs the tasks (see
+    `init_celery.start_worker_loop`), or else on first use, and stopped at
+    `worker_process_shutdown` / `worker_shutdown`: stopping cancels what is still
+    running and finalizes async generators, which closes the loop-bound
+    checkpointers. A loop inherited through fork is discarded.
+    """
+
+    def __init__(self, name: str = 'hephaestus-worker-loop'):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first use."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's loop thread doesn't exist in this process
+                self._loop = self._thread = None
+                self._pid = os.getpid()
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._pid == os.getpid() and self._loop is not None and self._loop.is_running()
+
+    def start(self):
+        self.loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logger.debug(f"Started {self.name} in process {self._pid}")
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule `coro` on the loop; returns a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: float | None = None) -> Any:
+        """Run `coro` on the loop and wait for its result (the `asyncio.run` replacement).
+
+        If the wait is interrupted (e.g. Celery's `SoftTimeLimitExceeded`),
+        the coroutine is cancelled before the exception propagates.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(f"Can't block on {self.name} from its own thread, await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 10.0):
+        """Cancel pending tasks, finalize async generators and close the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid() or loop.is_closed():
+                return
+            self._loop = self._thread = None
+
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+            await loop.shutdown_default_executor()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Unclean shutdown of {self.name}: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        logger.debug(f"Stopped {self.name} in process {os.getpid()}")
+
+
+worker_loop = WorkerLoop()
+
+
+def run_async(coro: Coroutine, timeout: float | None = None) -> Any:
+    """Run `coro` on this process's `worker_loop` and return its result."""
+    return worker_loop.run(coro, timeout)
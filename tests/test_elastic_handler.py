@@ -0,0 +1,49 @@
+import logging
+import threading
+import unittest
+from unittest import mock
+
+from hephaestus.logging import elastic_handler
+from hephaestus.logging.elastic_handler import ElasticHandler
+from hephaestus.settings import FrozenSettings
+
+_ES_SETTINGS = FrozenSettings({'ES_HOST': 'http://localhost:9200', 'ES_USERNAME': 'elastic',
+                               'ES_PASSWORD': 'secret', 'ES_CA': None, 'ES_INDEX': 'logs'})
+
+
+class ElasticHandlerStartTest(unittest.TestCase):
+    """Records logged while the ES runtime is being built must not deadlock the first emit."""
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.level = self.root.level
+        self.handler = ElasticHandler(flush_interval=3600)
+        self.root.addHandler(self.handler)
+        self.root.setLevel(logging.DEBUG)
+        patcher = mock.patch.object(elastic_handler, 'get_frozen_settings', lambda: _ES_SETTINGS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.root.removeHandler(self.handler)
+        self.root.setLevel(self.level)
+        _, self.handler.flush = self.handler.flush, lambda: None  # ES isn't reachable here
+        self.handler.close()
+        if elastic_handler._runtime is not None:
+            elastic_handler._runtime.loop.call_soon_threadsafe(elastic_handler._runtime.loop.stop)
+            elastic_handler._runtime = None
+
+    def test_first_record_at_debug(self):
+        thread = threading.Thread(target=logging.getLogger('hephaestus.test').debug, args=('first',),
+                                  daemon=True)
+        thread.start()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive(), "the first emit hung")
+        self.assertIsNotNone(elastic_handler._runtime)
+        # The record itself and what building the runtime logged (asyncio's selector) are buffered
+        self.assertGreaterEqual(self.handler.stats()['enqueued'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()